@@ -0,0 +1,7 @@
+-- Migration: Index ai_models_main by inference_provider
+-- Date: 2026-10-15
+-- Purpose: Deploy scripts count and delete one provider's rows at a time
+
+-- Serves WHERE inference_provider = %s in db_utils.get_record_count and delete_records
+CREATE INDEX IF NOT EXISTS idx_ai_models_main_inference_provider
+ON public.ai_models_main(inference_provider);
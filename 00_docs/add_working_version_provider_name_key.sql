@@ -0,0 +1,11 @@
+-- Migration: Add unique (inference_provider, human_readable_name) key for OpenRouter rows in working_version
+-- Date: 2026-10-15
+-- Purpose: Let the OpenRouter refresh upsert models in place instead of delete-then-insert
+
+-- Partial index: only OpenRouter rows are upserted, so other providers' delete+insert refreshes
+-- keep accepting repeated names. Used by ON CONFLICT ... WHERE inference_provider = 'OpenRouter'
+-- in openrouter_pipeline/01_scripts/T_refresh_supabase_working_version.py, which falls back to
+-- delete+insert while this index is missing.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_working_version_openrouter_name
+ON public.working_version(inference_provider, human_readable_name)
+WHERE inference_provider = 'OpenRouter';
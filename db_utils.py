@@ -6,8 +6,9 @@ Provides PostgreSQL connection helpers for pipeline_writer role
 
 import os
 import socket
+from operator import itemgetter
 import psycopg2
-from psycopg2.extras import execute_batch, RealDictCursor
+from psycopg2.extras import execute_batch, execute_values, RealDictCursor
 from typing import Optional, List, Dict, Any
 import logging
 
@@ -175,6 +176,45 @@ def get_record_count(conn, table_name: str, inference_provider: str) -> Optional
         return None
 
 
+def get_records_fingerprint(conn, table_name: str, inference_provider: str) -> Optional[str]:
+    """
+    Fingerprint the records for a specific inference provider.
+
+    Combines the row count with an md5 over the full text of every row, so any
+    insert, update or delete touching the provider's records changes it.
+    Cost: one aggregate query that reads, sorts and serializes all of the
+    provider's rows - fine for a few hundred rows, but not free on large tables.
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"SELECT COUNT(*), md5(COALESCE(string_agg(t::text, E'\\n' ORDER BY t::text), '')) "
+                f"FROM {table_name} t WHERE inference_provider = %s",
+                (inference_provider,)
+            )
+            count, digest = cur.fetchone()
+            return f"{count}:{digest}"
+    except Exception as e:
+        logger.error(f"Failed to fingerprint records: {str(e)}")
+        conn.rollback()
+        return None
+
+
+def index_exists(conn, table_name: str, index_name: str) -> bool:
+    """Check whether an index exists on a table (False if the lookup fails)."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT 1 FROM pg_indexes WHERE tablename = %s AND indexname = %s",
+                (table_name, index_name)
+            )
+            return cur.fetchone() is not None
+    except Exception as e:
+        logger.error(f"Failed to look up index {index_name}: {str(e)}")
+        conn.rollback()
+        return False
+
+
 def backup_records(conn, table_name: str, inference_provider: str) -> Optional[List[Dict[str, Any]]]:
     """Backup all records for a specific inference provider."""
     try:
@@ -189,15 +229,16 @@ def backup_records(conn, table_name: str, inference_provider: str) -> Optional[L
         return None
 
 
-def delete_records(conn, table_name: str, inference_provider: str) -> bool:
-    """Delete all records for a specific inference provider."""
+def delete_records(conn, table_name: str, inference_provider: str, commit: bool = True) -> bool:
+    """Delete all records for a specific inference provider. Pass commit=False to leave the transaction open."""
     try:
         with conn.cursor() as cur:
             cur.execute(
                 f"DELETE FROM {table_name} WHERE inference_provider = %s",
                 (inference_provider,)
             )
-        conn.commit()
+        if commit:
+            conn.commit()
         return True
     except Exception as e:
         logger.error(f"Failed to delete records: {str(e)}")
@@ -205,15 +246,26 @@ def delete_records(conn, table_name: str, inference_provider: str) -> bool:
         return False
 
 
-def insert_records_batch(conn, table_name: str, records: List[Dict[str, Any]], batch_size: int = 100) -> bool:
+def _row_tuples(records: List[Dict[str, Any]], columns: List[str]):
+    """Lazily project records to value tuples in column order."""
+    if len(columns) == 1:
+        column = columns[0]
+        return ((record[column],) for record in records)
+    get_row = itemgetter(*columns)
+    return (get_row(record) for record in records)
+
+
+def insert_records_batch(conn, table_name: str, records: List[Dict[str, Any]], batch_size: int = 100,
+                         commit: bool = True) -> bool:
     """
-    Insert records in batches.
+    Insert records in batches, one multi-row INSERT statement per batch.
 
     Args:
         conn: Database connection
         table_name: Target table
         records: List of dictionaries with column:value pairs
         batch_size: Number of records per batch
+        commit: Commit on success; pass False to leave the transaction open for the caller
 
     Returns:
         bool: True if successful
@@ -224,18 +276,18 @@ def insert_records_batch(conn, table_name: str, records: List[Dict[str, Any]], b
     try:
         # Get column names from first record
         columns = list(records[0].keys())
-        placeholders = ', '.join(['%s'] * len(columns))
         columns_str = ', '.join(columns)
 
-        insert_sql = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+        insert_sql = f"INSERT INTO {table_name} ({columns_str}) VALUES %s"
 
-        # Convert records to tuples
-        values = [tuple(record[col] for col in columns) for record in records]
+        # Convert records to tuples lazily; execute_values materializes one page at a time
+        values = _row_tuples(records, columns)
 
         with conn.cursor() as cur:
-            execute_batch(cur, insert_sql, values, page_size=batch_size)
+            execute_values(cur, insert_sql, values, page_size=batch_size)
 
-        conn.commit()
+        if commit:
+            conn.commit()
         return True
 
     except Exception as e:
@@ -244,6 +296,92 @@ def insert_records_batch(conn, table_name: str, records: List[Dict[str, Any]], b
         return False
 
 
+def upsert_records_batch(conn, table_name: str, records: List[Dict[str, Any]],
+                         conflict_columns: List[str], batch_size: int = 100, commit: bool = True,
+                         conflict_where: Optional[str] = None, touch_updated_at: bool = True) -> bool:
+    """
+    Insert records in batches, updating existing rows that match on conflict_columns.
+    Each batch is a single multi-row statement, so records must be unique on conflict_columns.
+
+    Args:
+        conn: Database connection
+        table_name: Target table
+        records: List of dictionaries with column:value pairs
+        conflict_columns: Columns of the unique key used for ON CONFLICT
+        batch_size: Number of records per batch
+        commit: Commit on success; pass False to leave the transaction open for the caller
+        conflict_where: Index predicate to add to ON CONFLICT when the unique key is a partial index
+        touch_updated_at: Set updated_at = CURRENT_TIMESTAMP on updated rows; only for tables with
+            that column, and skipped when the records carry their own updated_at
+
+    Returns:
+        bool: True if successful
+    """
+    if not records:
+        return True
+
+    try:
+        # Get column names from first record
+        columns = list(records[0].keys())
+        columns_str = ', '.join(columns)
+        conflict_target = f"({', '.join(conflict_columns)})"
+        if conflict_where:
+            conflict_target += f" WHERE {conflict_where}"
+
+        update_parts = [f"{col} = EXCLUDED.{col}" for col in columns if col not in conflict_columns]
+        if touch_updated_at and 'updated_at' not in columns:
+            update_parts.append('updated_at = CURRENT_TIMESTAMP')
+        conflict_action = f"DO UPDATE SET {', '.join(update_parts)}" if update_parts else "DO NOTHING"
+
+        upsert_sql = f"""
+            INSERT INTO {table_name} ({columns_str})
+            VALUES %s
+            ON CONFLICT {conflict_target}
+            {conflict_action}
+        """
+
+        # Convert records to tuples lazily; execute_values materializes one page at a time
+        values = _row_tuples(records, columns)
+
+        with conn.cursor() as cur:
+            execute_values(cur, upsert_sql, values, page_size=batch_size)
+
+        if commit:
+            conn.commit()
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to upsert records: {str(e)}")
+        conn.rollback()
+        return False
+
+
+def delete_stale_records(conn, table_name: str, inference_provider: str,
+                         key_column: str, keep_values: List[Any], commit: bool = True) -> Optional[int]:
+    """
+    Delete records for a specific inference provider whose key_column is not in keep_values
+    (rows with a NULL key_column are always deleted). Pass commit=False to leave the transaction open.
+
+    Returns:
+        int: Number of deleted records
+        None: If the delete fails
+    """
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"DELETE FROM {table_name} WHERE inference_provider = %s AND ({key_column} IS NULL OR NOT ({key_column} = ANY(%s)))",
+                (inference_provider, list(keep_values))
+            )
+            deleted_count = cur.rowcount
+        if commit:
+            conn.commit()
+        return deleted_count
+    except Exception as e:
+        logger.error(f"Failed to delete stale records: {str(e)}")
+        conn.rollback()
+        return None
+
+
 def load_staging_data(conn, staging_table: str, inference_provider: str) -> Optional[List[Dict[str, Any]]]:
     """Load data from staging table for specific provider."""
     try:
@@ -320,8 +458,8 @@ def upsert_rate_limits(conn, table_name: str, rate_limit_records: List[Dict[str,
 
         logger.info(f"SQL: {upsert_sql}")
 
-        # Convert records to tuples
-        values = [tuple(record.get(col) for col in columns) for record in rate_limit_records]
+        # Convert records to tuples lazily; execute_batch materializes one page at a time
+        values = (tuple(record.get(col) for col in columns) for record in rate_limit_records)
 
         with conn.cursor() as cur:
             execute_batch(cur, upsert_sql, values, page_size=100)
@@ -21,7 +21,7 @@ import json
 import sys
 import re
 from typing import Dict, List, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 def load_groq_models() -> List[Dict[str, Any]]:
@@ -140,7 +140,7 @@ def save_meta_results(meta_models: List[Dict[str, Any]]) -> str:
     
     output_data = {
         'metadata': {
-            'generated_at': datetime.now().isoformat() + '+00:00',
+            'generated_at': datetime.now(timezone.utc).isoformat(),
             'source_file': '../02_outputs/A-scrape-production-models.json',
             'processor': 'A_extract_meta_licenses.py',
             'total_models': len(meta_models),
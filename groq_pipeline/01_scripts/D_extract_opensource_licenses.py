@@ -17,22 +17,65 @@ Output: D-extract-opensource-licenses.json
 
 import json
 import sys
-import time
-from typing import Dict, List, Any
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+from datetime import datetime, timedelta, timezone
 
 # Consolidated license extraction functions (formerly from C and D scripts)
 import requests
 import re
 
+# Add utils directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent / '04_utils'))
+from http_utils import RateLimiter, get_retry_after, create_http_session
 
-def check_url_accessible(url: str) -> bool:
-    """Check if a URL is accessible with a HEAD request"""
-    try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
-        return response.status_code == 200
-    except (requests.RequestException, requests.Timeout):
-        return False
+# Persistent hf_id -> scraped license data cache, reused across runs while fresh
+HF_LICENSE_CACHE_FILE = Path(__file__).parent.parent / "05_cache" / "D-hf-license-cache.json"
+HF_LICENSE_CACHE_TTL = timedelta(days=7)
+
+# Scrape results that describe a failed lookup rather than a license; never cached
+FAILED_LICENSE_PREFIXES = ('HTTP ', 'Error:', 'Parse Error:')
+FAILED_LICENSE_NAMES = ('Not Found', 'No HF ID')
+
+# Concurrent HuggingFace lookups, capped to a polite request rate across all threads
+MAX_FETCH_WORKERS = 8
+HF_REQUESTS_PER_SECOND = 5
+
+# License patterns for the HuggingFace model page, in priority order; matched on raw bytes
+HF_LICENSE_PATTERNS = [
+    re.compile(rb'<span class="-mr-1 text-gray-400">License:</span>\s*<span>([^<]+)</span>', re.IGNORECASE),  # HF license structure
+    re.compile(rb'<span[^>]*>License:</span>[^<]*<span[^>]*>([^<]+)</span>', re.IGNORECASE),  # General license span structure
+    re.compile(rb'"license"\s*:\s*"([^"]+)"', re.IGNORECASE),  # JSON license field
+]
+
+# Streamed page scanning: stop at the HF license span, give up after the size cap
+HF_PAGE_CHUNK_SIZE = 65536
+HF_PAGE_MAX_BYTES = 1024 * 1024
+HF_MATCH_OVERLAP = 1024  # Re-scan this much of the previous bytes so matches can span chunks
+
+HF_RATE_LIMITER = RateLimiter(HF_REQUESTS_PER_SECOND, HF_REQUESTS_PER_SECOND)
+
+# Shared by all fetch threads so TCP/TLS connections to huggingface.co are reused
+HTTP_SESSION = create_http_session()
+
+
+def check_url_accessible(url: str, max_retries: int = 2) -> bool:
+    """Check if a URL is accessible with a HEAD request, with retry logic for rate limiting"""
+    for attempt in range(max_retries):
+        try:
+            HF_RATE_LIMITER.acquire()
+            response = HTTP_SESSION.head(url, timeout=5, allow_redirects=True)
+
+            if response.status_code == 429 and attempt < max_retries - 1:
+                # Pause the shared limiter so other threads back off too; acquire() waits it out
+                HF_RATE_LIMITER.pause(get_retry_after(response, (attempt + 1) * 3))  # default 3 seconds
+                continue
+
+            return response.status_code == 200
+        except (requests.RequestException, requests.Timeout):
+            return False
+    return False
 
 
 def get_huggingface_license_info(hf_id: str) -> Dict[str, str]:
@@ -87,45 +130,159 @@ def get_huggingface_license_info(hf_id: str) -> Dict[str, str]:
     }
 
 
-def extract_license_from_hf_page(hf_id: str) -> str:
-    """Extract license from HuggingFace page"""
+def fetch_hf_model_info(hf_id: str, etag: str = '', max_retries: int = 2) -> Tuple[int, Dict[str, Any], str]:
+    """
+    Fetch model metadata from the HuggingFace API as (status code, metadata, ETag)
+
+    When etag is given the request is conditional; a 304 status means the repo
+    is unchanged since that ETag was issued. Status 0 means the request failed.
+    """
+    headers = {'If-None-Match': etag} if etag else None
+    for attempt in range(max_retries):
+        try:
+            HF_RATE_LIMITER.acquire()
+            response = HTTP_SESSION.get(f"https://huggingface.co/api/models/{hf_id}", headers=headers, timeout=10)
+
+            if response.status_code == 429 and attempt < max_retries - 1:
+                # Pause the shared limiter so other threads back off too; acquire() waits it out
+                HF_RATE_LIMITER.pause(get_retry_after(response, (attempt + 1) * 3))  # default 3 seconds
+                continue
+
+            if response.status_code != 200:
+                return response.status_code, {}, ''
+            return 200, response.json(), response.headers.get('ETag', '')
+        except (requests.RequestException, ValueError):
+            return 0, {}, ''
+    return 0, {}, ''
+
+
+def extract_license_from_hf_api(data: Dict[str, Any]) -> str:
+    """
+    Read the license from HuggingFace model metadata
+
+    Returns the license shown on the model page: the card's license_name for
+    'other' licenses when set, otherwise the card license or license:* tag.
+    Returns an empty string when the metadata has no license for the repo.
+    """
+    card_data = data.get('cardData') or {}
+    license_name = card_data.get('license')
+    if isinstance(license_name, list):
+        license_name = license_name[0] if license_name else None
+    if not license_name:
+        license_name = next((tag.split(':', 1)[1] for tag in data.get('tags', [])
+                             if tag.startswith('license:')), None)
+    if license_name and license_name.lower() == 'other' and card_data.get('license_name'):
+        license_name = card_data['license_name']
+    return license_name.strip() if isinstance(license_name, str) else ''
+
+
+def find_license_in_page(response: requests.Response) -> str:
+    """Scan a streamed HF page for a license, returning early once the HF license span is found"""
+    primary_pattern = HF_LICENSE_PATTERNS[0]
+    content = b''
+
+    for chunk in response.iter_content(chunk_size=HF_PAGE_CHUNK_SIZE):
+        search_from = max(0, len(content) - HF_MATCH_OVERLAP)
+        content += chunk
+        match = primary_pattern.search(content, search_from)
+        if match:
+            # Return license exactly as found on the page
+            return match.group(1).decode('utf-8', 'replace').strip()
+        if len(content) >= HF_PAGE_MAX_BYTES:
+            break
+
+    for pattern in HF_LICENSE_PATTERNS[1:]:
+        match = pattern.search(content)
+        if match:
+            return match.group(1).decode('utf-8', 'replace').strip()
+
+    return "Not Found"
+
+
+def extract_license_from_hf_page(hf_id: str, model_info: Dict[str, Any], max_retries: int = 2) -> str:
+    """Extract license from HuggingFace, preferring the API metadata over scraping the page"""
     if not hf_id:
         return "No HF ID"
 
+    license_name = extract_license_from_hf_api(model_info)
+    if license_name:
+        return license_name
+
+    # Fallback: scrape the rendered model page
     url = f"https://huggingface.co/{hf_id}"
 
-    try:
-        # Add headers to mimic browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+    for attempt in range(max_retries):
+        try:
+            HF_RATE_LIMITER.acquire()
+            with HTTP_SESSION.get(url, timeout=10, stream=True) as response:
+                if response.status_code == 429 and attempt < max_retries - 1:
+                    # Pause the shared limiter so other threads back off too; acquire() waits it out
+                    HF_RATE_LIMITER.pause(get_retry_after(response, (attempt + 1) * 3))  # default 3 seconds
+                    continue
 
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            return f"HTTP {response.status_code}"
+                if response.status_code != 200:
+                    return f"HTTP {response.status_code}"
 
-        content = response.text
+                # Look for license information in the specific HuggingFace HTML structure
+                return find_license_in_page(response)
 
-        # Look for license information in the specific HuggingFace HTML structure
-        patterns = [
-            r'<span class="-mr-1 text-gray-400">License:</span>\s*<span>([^<]+)</span>',  # HF license structure
-            r'<span[^>]*>License:</span>[^<]*<span[^>]*>([^<]+)</span>',  # General license span structure
-            r'"license"\s*:\s*"([^"]+)"',  # JSON license field
-        ]
+        except requests.RequestException as e:
+            return f"Error: {str(e)}"
+        except Exception as e:
+            return f"Parse Error: {str(e)}"
 
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                license_name = match.group(1).strip()
-                # Return license exactly as found on the page
-                return license_name
+    return "Not Found"
 
-        return "Not Found"
 
-    except requests.RequestException as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        return f"Parse Error: {str(e)}"
+def fetch_hf_license_data(hf_id: str) -> Tuple[str, str, str]:
+    """Find the raw license name, best license info URL and API ETag for one HF repo"""
+    _, model_info, etag = fetch_hf_model_info(hf_id)
+    raw_license_name = extract_license_from_hf_page(hf_id, model_info)
+    license_info_url = get_huggingface_license_info(hf_id).get('license_info_url', '')
+    return raw_license_name, license_info_url, etag
+
+
+def is_hf_repo_unchanged(hf_id: str, etag: str) -> bool:
+    """Check with a conditional API request whether a repo still matches its cached ETag"""
+    status_code, _, _ = fetch_hf_model_info(hf_id, etag)
+    return status_code == 304
+
+
+def is_cacheable_license_data(raw_license_name: str, license_info_url: str) -> bool:
+    """Check if scraped license data is a real result worth caching across runs"""
+    return (bool(license_info_url)
+            and raw_license_name not in FAILED_LICENSE_NAMES
+            and not raw_license_name.startswith(FAILED_LICENSE_PREFIXES))
+
+
+def is_fresh_cache_entry(entry: Dict[str, str]) -> bool:
+    """Check if a cache entry is younger than HF_LICENSE_CACHE_TTL"""
+    try:
+        return datetime.fromisoformat(entry['cached_at']) >= datetime.now(timezone.utc) - HF_LICENSE_CACHE_TTL
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def load_hf_license_cache(cache_file: Path) -> Dict[str, Dict[str, str]]:
+    """Load cached hf_id -> license data entries, keeping expired ones that can be revalidated by ETag"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return {}
+
+    return {hf_id: entry for hf_id, entry in cache.items()
+            if is_fresh_cache_entry(entry) or entry.get('etag')}
+
+
+def save_hf_license_cache(cache: Dict[str, Dict[str, str]], cache_file: Path) -> None:
+    """Write the hf_id -> license data cache back to disk"""
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"Warning: Failed to write HF license cache {cache_file}: {e}")
 
 
 def load_groq_models() -> List[Dict[str, Any]]:
@@ -225,6 +382,11 @@ def standardize_license_name(license_name: str, standardization_mappings: Dict[s
     return standardization_mappings.get(license_lower, license_name)
 
 
+def is_meta_model(model_id: str, provider: str) -> bool:
+    """Check if model is from Meta (handled by C_extract_meta_licenses.py)"""
+    return 'llama' in model_id.lower() or provider.lower() == 'meta'
+
+
 def is_google_model(model_id: str, provider: str) -> bool:
     """Check if model is from Google"""
     return (provider.lower() == 'google' or 
@@ -260,13 +422,63 @@ def extract_hf_scraped_and_google_licenses(models: List[Dict[str, Any]]) -> List
     print(f"Loaded {len(standardization_mappings)} standardization rules")
     print(f"Loaded {len(license_url_mappings)} opensource license URL mappings")
     print(f"Loaded {len(google_mappings)} Google license mappings")
+
+    # Look up every HF-mappable model concurrently before the in-order pass below
+    hf_ids_by_model_id = {}
+    for model in models:
+        model_id = model.get('model_id', '')
+        provider = model.get('model_provider', '')
+        if is_meta_model(model_id, provider) or is_google_model(model_id, provider):
+            continue
+        hf_id = detect_hf_id(model_id, hf_mappings)
+        if hf_id:
+            hf_ids_by_model_id[model_id] = hf_id
+
+    # Reuse license data scraped by earlier runs; expired entries are kept if HF
+    # confirms with a 304 that the repo is unchanged since their ETag
+    hf_license_cache = load_hf_license_cache(HF_LICENSE_CACHE_FILE)
+    stale_hf_ids = sorted({hf_id for hf_id in hf_ids_by_model_id.values()
+                           if hf_id in hf_license_cache and not is_fresh_cache_entry(hf_license_cache[hf_id])})
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        unchanged = executor.map(is_hf_repo_unchanged, stale_hf_ids,
+                                 [hf_license_cache[hf_id]['etag'] for hf_id in stale_hf_ids])
+        for hf_id, is_unchanged in zip(stale_hf_ids, unchanged):
+            if is_unchanged:
+                hf_license_cache[hf_id]['cached_at'] = datetime.now(timezone.utc).isoformat()
+            else:
+                del hf_license_cache[hf_id]
+
+    # Several Groq models can map to the same HF repo; look each repo up once
+    license_data_by_hf_id = {}
+    for hf_id in hf_ids_by_model_id.values():
+        if hf_id in hf_license_cache:
+            cached = hf_license_cache[hf_id]
+            license_data_by_hf_id[hf_id] = (cached['raw_license_name'], cached['license_info_url'])
+    pending_hf_ids = list(dict.fromkeys(hf_id for hf_id in hf_ids_by_model_id.values()
+                                        if hf_id not in license_data_by_hf_id))
+
+    print(f"Fetching HuggingFace license data for {len(pending_hf_ids)} repos "
+          f"({len(license_data_by_hf_id)} cached, {len(stale_hf_ids)} revalidated)...")
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        fetched = executor.map(fetch_hf_license_data, pending_hf_ids)
+        for hf_id, (raw_license_name, license_info_url, etag) in zip(pending_hf_ids, fetched):
+            license_data_by_hf_id[hf_id] = (raw_license_name, license_info_url)
+            if is_cacheable_license_data(raw_license_name, license_info_url):
+                hf_license_cache[hf_id] = {
+                    'raw_license_name': raw_license_name,
+                    'license_info_url': license_info_url,
+                    'etag': etag,
+                    'cached_at': datetime.now(timezone.utc).isoformat()
+                }
+
+    save_hf_license_cache(hf_license_cache, HF_LICENSE_CACHE_FILE)
     
     for model in models:
         model_id = model.get('model_id', '')
         provider = model.get('model_provider', '')
         
         # CATEGORY 1: Skip Meta models (handled by A_extract_meta_licenses.py)
-        if 'llama' in model_id.lower() or provider.lower() == 'meta':
+        if is_meta_model(model_id, provider):
             continue
         
         # CATEGORY 2: Google models (use hardcoded licenses)
@@ -297,18 +509,14 @@ def extract_hf_scraped_and_google_licenses(models: List[Dict[str, Any]]) -> List
         
         print(f"Processing HF-mappable model: {model_id} → {hf_id}")
         
-        # Step 1: Extract license name by scraping HuggingFace page
-        print(f"  Scraping license name from HF page...")
-        raw_license_name = extract_license_from_hf_page(hf_id)
+        # Steps 1 and 3: License name scraped from the HF page and best license info URL
+        # using priority-based detection, both fetched concurrently above
+        raw_license_name, license_info_url = license_data_by_hf_id[hf_id]
         
         # Step 2: Standardize license name
         standardized_license_name = standardize_license_name(raw_license_name, standardization_mappings)
         print(f"  License name: '{raw_license_name}' → '{standardized_license_name}'")
-        
-        # Step 3: Extract license info URL using priority-based detection
-        print(f"  Finding best license info URL...")
-        hf_license_info = get_huggingface_license_info(hf_id)
-        license_info_url = hf_license_info.get('license_info_url', '')
+        print(f"  License info URL: {license_info_url or 'Not found'}")
         
         # Step 4: Apply 2-category logic based on opensource license URL mappings
         is_opensource = (standardized_license_name and 
@@ -345,9 +553,6 @@ def extract_hf_scraped_and_google_licenses(models: List[Dict[str, Any]]) -> List
             print(f"  CUSTOM: No URL mapping for '{standardized_license_name}', using HF URL")
         
         processed_models.append(hf_model)
-        
-        # Add delay to be respectful to HuggingFace
-        time.sleep(1)
     
     print(f"\nProcessed {len(processed_models)} models total")
     
@@ -370,7 +575,7 @@ def save_processed_results(processed_models: List[Dict[str, Any]]) -> str:
     
     output_data = {
         'metadata': {
-            'generated_at': datetime.now().isoformat() + '+00:00',
+            'generated_at': datetime.now(timezone.utc).isoformat(),
             'source_file': '../02_outputs/A-scrape-production-models.json',
             'processor': 'B_extract_opensource_licenses.py',
             'approach': '3-category processing: Meta (skipped), Google (hardcoded), Others (HF-scraped)',
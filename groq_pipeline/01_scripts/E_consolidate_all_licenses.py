@@ -20,7 +20,7 @@ Output:
 import json
 import sys
 from typing import Dict, List, Any
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 def load_meta_licenses() -> List[Dict[str, Any]]:
@@ -164,7 +164,7 @@ def save_consolidated_results(provider_mappings: Dict[str, Dict[str, Dict[str, s
     # Build final structure expected by groq_pipeline.py
     consolidated_data = {
         'metadata': {
-            'generated_at': datetime.now().isoformat() + '+00:00',
+            'generated_at': datetime.now(timezone.utc).isoformat(),
             'consolidation_processor': 'F_consolidate_all_licenses.py',
             'source_files': [
                 'C-extract-meta-licenses.json',
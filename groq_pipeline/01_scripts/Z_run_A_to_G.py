@@ -17,6 +17,7 @@ Note: H and I scripts (Supabase refresh and deployment) are run separately via G
 
 Features:
 - Sequential execution with dependency management
+- Concurrent execution of independent stages (C and D)
 - Comprehensive error handling and logging
 - Real-time progress reporting
 - Execution timing and statistics
@@ -31,6 +32,7 @@ import os
 import sys
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
@@ -53,13 +55,15 @@ PIPELINE_SCRIPTS = [
         'script': 'C_extract_meta_licenses.py',
         'name': 'Meta/Llama License Extraction',
         'description': 'Extract official Meta/Llama license information',
-        'required': True
+        'required': True,
+        'parallel_group': 'license_extraction'  # C and D only read A's output
     },
     {
         'script': 'D_extract_opensource_licenses.py',
         'name': 'HuggingFace & Google License Extraction',
         'description': 'Extract HF-scraped and Google model licenses',
-        'required': True
+        'required': True,
+        'parallel_group': 'license_extraction'
     },
     {
         'script': 'E_consolidate_all_licenses.py',
@@ -102,44 +106,60 @@ def check_script_exists(script_path: Path) -> bool:
     """Check if script file exists and is executable"""
     return script_path.exists() and script_path.is_file()
 
-def execute_script(script_info: Dict) -> Tuple[bool, str, float]:
+def execute_script(script_info: Dict, output: Optional[List[str]] = None) -> Tuple[bool, str, float]:
     """
     Execute a single pipeline script.
 
     Args:
         script_info: Dictionary with script metadata
+        output: If given, the script's stdout and the runner's messages are
+            collected here instead of printed, so scripts running concurrently
+            can be reported one block at a time
 
     Returns:
         Tuple of (success, output, duration_seconds)
     """
+    def log(message: str = "") -> None:
+        if output is None:
+            print(message)
+        else:
+            output.append(message)
+
     script_name = script_info['script']
     script_path = Path(script_name)
 
-    print(f"\n{'='*80}")
-    print(f"EXECUTING: {script_info['name']}")
-    print(f"{'='*80}")
-    print(f"Script: {script_name}")
-    print(f"Description: {script_info['description']}")
-    print(f"Started at: {get_ist_timestamp()}")
-    print(f"Required: {'Yes' if script_info['required'] else 'No'}")
+    log(f"\n{'='*80}")
+    log(f"EXECUTING: {script_info['name']}")
+    log(f"{'='*80}")
+    log(f"Script: {script_name}")
+    log(f"Description: {script_info['description']}")
+    log(f"Started at: {get_ist_timestamp()}")
+    log(f"Required: {'Yes' if script_info['required'] else 'No'}")
 
     if not check_script_exists(script_path):
         error_msg = f"❌ ERROR: Script not found: {script_path}"
-        print(error_msg)
+        log(error_msg)
         return False, error_msg, 0.0
 
     start_time = time.time()
 
     try:
         # Execute script with real-time output
-        print(f"\n🚀 Starting execution...")
+        log(f"\n🚀 Starting execution...")
 
         # Use aienv Python if available, otherwise use current Python
         python_exec = '/home/vn6295337/aienv/bin/python3' if Path('/home/vn6295337/aienv/bin/python3').exists() else sys.executable
 
+        if output is None:
+            # Flush our own buffered output so it is not reordered with the child's
+            sys.stdout.flush()
+
+        # Serial steps pass child stdout straight through instead of buffering it in
+        # memory; concurrent steps capture it. stderr is captured for the failure report
         result = subprocess.run(
             [python_exec, script_name],
-            capture_output=True,
+            stdout=None if output is None else subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
             timeout=1800,  # 30 minute timeout
             env=os.environ  # Pass through all environment variables
@@ -147,38 +167,55 @@ def execute_script(script_info: Dict) -> Tuple[bool, str, float]:
 
         duration = time.time() - start_time
 
-        # Print captured output
         if result.stdout:
-            print(f"\n📤 STDOUT:")
-            print(result.stdout)
+            log(result.stdout.rstrip('\n'))
 
         if result.stderr:
-            print(f"\n📤 STDERR:")
-            print(result.stderr)
+            log(f"\n📤 STDERR:")
+            log(result.stderr)
 
         if result.returncode == 0:
-            print(f"\n✅ SUCCESS: {script_info['name']} completed")
-            print(f"Duration: {format_duration(duration)}")
-            return True, result.stdout, duration
+            log(f"\n✅ SUCCESS: {script_info['name']} completed")
+            log(f"Duration: {format_duration(duration)}")
+            return True, "", duration
         else:
             error_msg = f"❌ FAILED: {script_info['name']} (exit code: {result.returncode})"
-            print(error_msg)
+            log(error_msg)
             if result.stderr:
-                print(f"Error details: {result.stderr}")
+                log(f"Error details: {result.stderr}")
             return False, result.stderr or "Unknown error", duration
 
     except subprocess.TimeoutExpired:
         duration = time.time() - start_time
         error_msg = f"❌ TIMEOUT: {script_info['name']} exceeded 30 minutes"
-        print(error_msg)
+        log(error_msg)
         return False, error_msg, duration
 
     except Exception as e:
         duration = time.time() - start_time
         error_msg = f"❌ EXCEPTION: {script_info['name']} failed with: {str(e)}"
-        print(error_msg)
+        log(error_msg)
         return False, error_msg, duration
 
+def group_pipeline_steps(scripts: List[Dict]) -> List[List[Dict]]:
+    """
+    Group consecutive scripts sharing a parallel_group into a single step.
+
+    Args:
+        scripts: Ordered list of script metadata dictionaries
+
+    Returns:
+        List of steps, each a list of scripts that can run concurrently
+    """
+    steps = []
+    for script_info in scripts:
+        group = script_info.get('parallel_group')
+        if group and steps and steps[-1][-1].get('parallel_group') == group:
+            steps[-1].append(script_info)
+        else:
+            steps.append([script_info])
+    return steps
+
 def generate_execution_report(results: List[Tuple[Dict, bool, str, float]]) -> str:
     """Generate comprehensive execution report"""
 
@@ -329,21 +366,33 @@ def main():
     # Execute all scripts
     results = []
     overall_start_time = time.time()
+    steps = group_pipeline_steps(PIPELINE_SCRIPTS)
+
+    for i, step in enumerate(steps, 1):
+        print(f"\n🎯 STEP {i}/{len(steps)}")
+
+        if len(step) > 1:
+            # Independent scripts: run side by side, wait for all before moving on,
+            # then print each script's output as one block so they do not interleave
+            step_outputs = [[] for _ in step]
+            with ThreadPoolExecutor(max_workers=len(step)) as executor:
+                step_results = list(executor.map(execute_script, step, step_outputs))
+            for step_output in step_outputs:
+                print('\n'.join(step_output))
+        else:
+            step_results = [execute_script(step[0])]
 
-    for i, script_info in enumerate(PIPELINE_SCRIPTS, 1):
-        print(f"\n🎯 STEP {i}/{len(PIPELINE_SCRIPTS)}")
-
-        success, output, duration = execute_script(script_info)
-        results.append((script_info, success, output, duration))
+        for script_info, (success, output, duration) in zip(step, step_results):
+            results.append((script_info, success, output, duration))
 
-        # Check if we should continue
-        if not success and script_info['required']:
-            print(f"\n💥 CRITICAL FAILURE: Required script {script_info['script']} failed")
-            print("Pipeline execution will continue, but results may be incomplete")
-            # Continue execution but mark as critical failure
+            # Check if we should continue
+            if not success and script_info['required']:
+                print(f"\n💥 CRITICAL FAILURE: Required script {script_info['script']} failed")
+                print("Pipeline execution will continue, but results may be incomplete")
+                # Continue execution but mark as critical failure
 
-        # Brief pause between scripts
-        if i < len(PIPELINE_SCRIPTS):
+        # Brief pause between steps
+        if i < len(steps):
             time.sleep(2)
 
     overall_duration = time.time() - overall_start_time
@@ -11,6 +11,7 @@ Features:
 - Centralized API endpoint management
 - License mapping coordination
 - Error handling with fallback defaults
+- Fast JSON parsing via orjson when installed
 - Consistent path resolution
 
 Author: AI Models Discovery Pipeline
@@ -23,6 +24,35 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def read_json_file(file_path) -> Any:
+    """
+    Read and parse a JSON file, using orjson when it is available
+
+    Args:
+        file_path: Path to the JSON file
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
 class GroqConfig:
     """Centralized configuration manager for Groq pipeline"""
@@ -45,6 +75,10 @@ class GroqConfig:
         """
         Load configuration from 03_configs/{config_name}.json
 
+        Missing or invalid files are cached as an empty dict, so repeated
+        lookups (e.g. once per model) do not retry the file or re-raise.
+        Use reload_config() to pick up a file added or fixed mid-run.
+
         Args:
             config_name: Name of config file (without .json extension)
 
@@ -58,8 +92,7 @@ class GroqConfig:
         config_file = self.configs_dir / f"{config_name}.json"
 
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            config_data = read_json_file(config_file)
 
             # Cache the loaded config
             self._config_cache[config_name] = config_data
@@ -68,10 +101,11 @@ class GroqConfig:
 
         except FileNotFoundError:
             print(f"⚠️ Configuration file not found: {config_file}")
-            return {}
         except json.JSONDecodeError as e:
             print(f"❌ Error parsing configuration {config_name}: {e}")
-            return {}
+
+        self._config_cache[config_name] = {}
+        return {}
 
     def get_api_endpoints(self) -> Dict[str, str]:
         """
@@ -309,8 +343,7 @@ class GroqConfig:
             return False
 
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                json.load(f)
+            read_json_file(config_file)
             print(f"✓ Config file valid: {config_name}")
             return True
         except json.JSONDecodeError as e:
@@ -18,17 +18,26 @@ Version: 1.0
 """
 
 import json
-import csv
 import os
 import sys
 import re
-from datetime import datetime
+import string
+from collections import Counter
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 
-from config_manager import get_config
+from config_manager import get_config, read_json_file
 from path_manager import get_output_path, get_config_path
 
+_UTC = timezone.utc
+
+# Print normalization progress every N models instead of once per model
+PROGRESS_INTERVAL = 50
+
+# Rate limit keys in display order
+_RATE_LIMIT_KEYS = ('RPM', 'TPM', 'RPD', 'TPD', 'ASH', 'ASD')
+
 
 class GroqDataProcessor:
     """Data processing and normalization for Groq pipeline"""
@@ -89,8 +98,7 @@ class GroqDataProcessor:
         file_path = get_output_path(filename)
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return read_json_file(file_path)
         except FileNotFoundError:
             print(f"❌ File not found: {file_path}")
             return {}
@@ -133,18 +141,20 @@ class GroqDataProcessor:
 
         # Remove patterns
         for pattern in standardization_rules.get('remove_patterns', []):
-            name = name.replace(pattern, '')
+            if pattern in name:
+                name = name.replace(pattern, '')
 
         # Replace patterns
         for old, new in standardization_rules.get('replace_patterns', {}).items():
-            name = name.replace(old, new)
+            if old in name:
+                name = name.replace(old, new)
 
         # Extract human readable name (remove provider prefix if exists)
         if '/' in name:
             name = name.split('/')[-1]
 
         # Capitalize first letter of each word
-        name = ' '.join(word.capitalize() for word in name.replace('-', ' ').split())
+        name = string.capwords(name.replace('-', ' '))
 
         return name
 
@@ -188,72 +198,54 @@ class GroqDataProcessor:
         """
         return self.config.get_timestamp_patterns()
 
-    def standardize_modalities(self, modalities_list: List[str], modality_mappings: Dict[str, str]) -> List[str]:
+    def standardize_and_sort_modalities(self, modalities_list: List[str], modality_mappings: Dict[str, str],
+                                        ordering_priority: Dict[str, int]) -> List[str]:
         """
-        Standardize modality names using mappings
+        Standardize, deduplicate and priority-sort modalities in a single pass
 
         Args:
             modalities_list: List of raw modality names
             modality_mappings: Standardization mappings
+            ordering_priority: Priority mappings
 
         Returns:
-            List of standardized modality names
+            Sorted list of unique standardized modality names
         """
         if not modalities_list:
             return []
 
-        standardized = []
-        for modality in modalities_list:
-            standardized_mod = modality_mappings.get(modality.lower(), modality)
-            if standardized_mod not in standardized:
-                standardized.append(standardized_mod)
-
-        return standardized
-
-    def sort_modalities(self, modalities_list: List[str], ordering_priority: Dict[str, int]) -> List[str]:
-        """
-        Sort modalities based on priority order
-
-        Args:
-            modalities_list: List of modalities to sort
-            ordering_priority: Priority mappings
-
-        Returns:
-            Sorted list of modalities
-        """
-        if not modalities_list or not ordering_priority:
-            return modalities_list
-
-        return sorted(modalities_list, key=lambda x: ordering_priority.get(x, 999))
+        unique = dict.fromkeys(modality_mappings.get(m.lower(), m) for m in modalities_list)
+        return sorted(unique, key=lambda x: ordering_priority.get(x, 999))
 
-    def format_timestamp(self, unix_timestamp: Optional[int], timestamp_patterns: Dict[str, str]) -> str:
+    def format_timestamp(self, unix_timestamp: Optional[int], timestamp_patterns: Dict[str, str],
+                         default_iso: Optional[str] = None) -> str:
         """
         Format timestamp using standardized patterns
 
         Args:
             unix_timestamp: Unix timestamp or None
             timestamp_patterns: Formatting patterns
+            default_iso: Precomputed fallback timestamp (defaults to now)
 
         Returns:
             Formatted timestamp string
         """
-        if not timestamp_patterns:
-            # Fallback to default formatting
-            if unix_timestamp:
-                return datetime.fromtimestamp(int(unix_timestamp)).isoformat() + '+00:00'
-            else:
-                return datetime.now().isoformat() + '+00:00'
+        if unix_timestamp:
+            if not timestamp_patterns:
+                # Fallback to default formatting
+                return datetime.fromtimestamp(int(unix_timestamp), tz=_UTC).isoformat()
 
-        try:
-            if unix_timestamp:
+            try:
                 # Use unix conversion template
-                return datetime.fromtimestamp(int(unix_timestamp)).isoformat() + '+00:00'
-            else:
-                # Use default fallback template
-                return datetime.now().isoformat() + '+00:00'
-        except (ValueError, TypeError):
-            # Error handling - use fallback
-            return datetime.now().isoformat() + '+00:00'
+                return datetime.fromtimestamp(int(unix_timestamp), tz=_UTC).isoformat()
+            except (ValueError, TypeError):
+                # Error handling - use fallback
+                pass
+
+        # Use default fallback template, only read the clock when it is needed
+        if default_iso is None:
+            default_iso = datetime.now(_UTC).isoformat()
+        return default_iso
 
     def get_modalities(self, model_id: str, modalities_data: Dict[str, Any]) -> Tuple[str, str]:
         """
@@ -271,16 +263,28 @@ class GroqDataProcessor:
         # Load standardization mappings
         modality_mappings, ordering_priority = self.load_modality_standardization()
 
+        return self.format_modalities(model_data, modality_mappings, ordering_priority)
+
+    def format_modalities(self, model_data: Dict[str, Any], modality_mappings: Dict[str, str],
+                          ordering_priority: Dict[str, int]) -> Tuple[str, str]:
+        """
+        Format a single model's modalities entry with standardization
+
+        Args:
+            model_data: The model's entry from the modalities dataset
+            modality_mappings: Standardization mappings
+            ordering_priority: Priority mappings
+
+        Returns:
+            Tuple of (input_modalities_str, output_modalities_str)
+        """
         # Get raw modalities
         input_modalities = model_data.get('input_modalities', [])
         output_modalities = model_data.get('output_modalities', [])
 
         # Standardize and sort modalities
-        input_standardized = self.standardize_modalities(input_modalities, modality_mappings)
-        output_standardized = self.standardize_modalities(output_modalities, modality_mappings)
-
-        input_sorted = self.sort_modalities(input_standardized, ordering_priority)
-        output_sorted = self.sort_modalities(output_standardized, ordering_priority)
+        input_sorted = self.standardize_and_sort_modalities(input_modalities, modality_mappings, ordering_priority)
+        output_sorted = self.standardize_and_sort_modalities(output_modalities, modality_mappings, ordering_priority)
 
         # Join with commas and spaces for proper formatting
         input_mods = ', '.join(input_sorted)
@@ -336,20 +340,8 @@ class GroqDataProcessor:
             return ""
 
         # Format as "RPM: X, TPM: Y, RPD: Z, TPD: W"
-        rpm = model_limits.get('RPM', '')
-        tpm = model_limits.get('TPM', '')
-        rpd = model_limits.get('RPD', '')
-        tpd = model_limits.get('TPD', '')
-        ash = model_limits.get('ASH', '')
-        asd = model_limits.get('ASD', '')
-
-        parts = []
-        if rpm and rpm != '-': parts.append(f"RPM: {rpm}")
-        if tpm and tpm != '-': parts.append(f"TPM: {tpm}")
-        if rpd and rpd != '-': parts.append(f"RPD: {rpd}")
-        if tpd and tpd != '-': parts.append(f"TPD: {tpd}")
-        if ash and ash != '-': parts.append(f"ASH: {ash}")
-        if asd and asd != '-': parts.append(f"ASD: {asd}")
+        parts = [f"{key}: {value}" for key in _RATE_LIMIT_KEYS
+                 if (value := model_limits.get(key)) and value != '-']
 
         return ', '.join(parts)
 
@@ -375,73 +367,75 @@ class GroqDataProcessor:
         total_normalized = len(normalized_data)
         success_rate = (total_normalized / total_extracted * 100) if total_extracted > 0 else 0
 
-        with open(report_path, 'w', encoding='utf-8') as f:
-            # Header
-            f.write("=" * 80 + "\n")
-            f.write("GROQ PIPELINE NORMALIZATION REPORT\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
+        production_models_list = production_models.get('production_models', [])
 
-            # Summary
-            f.write("SUMMARY:\n")
-            f.write(f"  Total models extracted: {total_extracted}\n")
-            f.write(f"  Models filtered out: 0\n")  # Groq only extracts production models
-            f.write(f"  Models normalized: {total_normalized}\n")
-            f.write(f"  Models unchanged: 0\n")
-            f.write(f"  Success rate: {success_rate:.1f}%\n\n")
+        lines = []
 
-            # Models normalized details
-            f.write(f"MODELS NORMALIZED: {total_normalized}\n")
-            f.write("-" * 40 + "\n")
+        # Header
+        lines.append("=" * 80 + "\n")
+        lines.append("GROQ PIPELINE NORMALIZATION REPORT\n")
+        lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        lines.append("=" * 80 + "\n\n")
 
-            for idx, record in enumerate(normalized_data, 1):
-                provider = record['model_provider'].upper()
-                human_name = record['human_readable_name']
-
-                # Find original model data by matching record ID with list index
-                original_model = None
-                original_model_id = ""
-                production_models_list = production_models.get('production_models', [])
-                if idx <= len(production_models_list):
-                    original_model = production_models_list[idx - 1]  # idx is 1-based, list is 0-based
-                    original_model_id = original_model.get('model_id', '')
-
-                f.write(f"   {idx}. {provider} - {human_name}\n")
-                if original_model_id and original_model_id != human_name:
-                    f.write(f"      Model Name: {original_model_id} -> {human_name}\n")
-
-                # Input/Output modalities
-                if record.get('input_modalities'):
-                    f.write(f"      Input Modalities: {record['input_modalities']}\n")
-                if record.get('output_modalities'):
-                    f.write(f"      Output Modalities: {record['output_modalities']}\n")
-
-                # License info
-                if record.get('license_name'):
-                    f.write(f"      License: {record.get('license_info_text', '')} -> {record['license_name']}\n")
-
-                # Rate limits summary
-                if record.get('rate_limits'):
-                    rate_limits_display = record['rate_limits'][:50]
-                    if len(record['rate_limits']) > 50:
-                        rate_limits_display += '...'
-                    f.write(f"      Rate Limits: {rate_limits_display}\n")
+        # Summary
+        lines.append("SUMMARY:\n")
+        lines.append(f"  Total models extracted: {total_extracted}\n")
+        lines.append(f"  Models filtered out: 0\n")  # Groq only extracts production models
+        lines.append(f"  Models normalized: {total_normalized}\n")
+        lines.append(f"  Models unchanged: 0\n")
+        lines.append(f"  Success rate: {success_rate:.1f}%\n\n")
 
-                f.write("\n")
+        # Models normalized details
+        lines.append(f"MODELS NORMALIZED: {total_normalized}\n")
+        lines.append("-" * 40 + "\n")
 
-            # Provider summary
-            f.write("PROVIDER SUMMARY:\n")
-            f.write("-" * 40 + "\n")
+        for idx, record in enumerate(normalized_data, 1):
+            provider = record['model_provider'].upper()
+            human_name = record['human_readable_name']
 
-            provider_counts = {}
-            for record in normalized_data:
-                provider = record['model_provider']
-                provider_counts[provider] = provider_counts.get(provider, 0) + 1
+            # Find original model data by matching record ID with list index
+            original_model = None
+            original_model_id = ""
+            if idx <= len(production_models_list):
+                original_model = production_models_list[idx - 1]  # idx is 1-based, list is 0-based
+                original_model_id = original_model.get('model_id', '')
 
-            for provider, count in sorted(provider_counts.items()):
-                f.write(f"  {provider}: {count} models\n")
+            lines.append(f"   {idx}. {provider} - {human_name}\n")
+            if original_model_id and original_model_id != human_name:
+                lines.append(f"      Model Name: {original_model_id} -> {human_name}\n")
 
-            f.write(f"\nTotal providers: {len(provider_counts)}\n")
+            # Input/Output modalities
+            if record.get('input_modalities'):
+                lines.append(f"      Input Modalities: {record['input_modalities']}\n")
+            if record.get('output_modalities'):
+                lines.append(f"      Output Modalities: {record['output_modalities']}\n")
+
+            # License info
+            if record.get('license_name'):
+                lines.append(f"      License: {record.get('license_info_text', '')} -> {record['license_name']}\n")
+
+            # Rate limits summary
+            if record.get('rate_limits'):
+                rate_limits_display = record['rate_limits'][:50]
+                if len(record['rate_limits']) > 50:
+                    rate_limits_display += '...'
+                lines.append(f"      Rate Limits: {rate_limits_display}\n")
+
+            lines.append("\n")
+
+        # Provider summary
+        lines.append("PROVIDER SUMMARY:\n")
+        lines.append("-" * 40 + "\n")
+
+        provider_counts = Counter(record['model_provider'] for record in normalized_data)
+
+        for provider, count in sorted(provider_counts.items()):
+            lines.append(f"  {provider}: {count} models\n")
+
+        lines.append(f"\nTotal providers: {len(provider_counts)}\n")
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(lines))
 
         print(f"📄 Normalization report generated: {report_path}")
         return str(report_path)
@@ -464,7 +458,6 @@ class GroqDataProcessor:
         modalities = self.load_json_file('B-scrape-modalities.json')
         provider_mappings = self.config.get_provider_mappings()
         license_mappings = self.load_json_file('E-consolidate-all-licenses.json')
-        database_schema = self.config.get_database_schema()
 
         # Get standardization rules
         standardization = provider_mappings.get('model_name_standardization', {})
@@ -472,24 +465,32 @@ class GroqDataProcessor:
         # Load timestamp patterns
         timestamp_patterns = self.load_timestamp_patterns()
 
+        # Resolve per-model lookup tables and modality rules once for the whole run
+        modalities_by_model = modalities.get('modalities', {})
+        modality_mappings, ordering_priority = self.load_modality_standardization()
+
         normalized_data = []
-        current_timestamp = datetime.now().isoformat() + '+00:00'
+        current_timestamp = datetime.now(_UTC).isoformat()
 
         production_models_list = production_models.get('production_models', [])
-        print(f"Processing {len(production_models_list)} models...")
+        total_models = len(production_models_list)
+        print(f"Processing {total_models} models...")
 
         # Process each production model
         for idx, model in enumerate(production_models_list, 1):
             model_id = model['model_id']
             model_provider = model['model_provider']
 
-            print(f"Processing {model_id}...")
+            if idx % PROGRESS_INTERVAL == 0 or idx == total_models:
+                print(f"Processing model {idx}/{total_models}...")
 
             # Get provider info
             country, official_url = self.get_provider_info(model_provider, provider_mappings)
 
             # Get modalities
-            input_mods, output_mods = self.get_modalities(model_id, modalities)
+            input_mods, output_mods = self.format_modalities(
+                modalities_by_model.get(model_id, {}), modality_mappings, ordering_priority
+            )
 
             # Get license info
             license_text, license_url_info, license_name, license_url = self.get_license_info(model_id, model_provider, license_mappings)
@@ -514,7 +515,7 @@ class GroqDataProcessor:
                 'license_url': license_url,
                 'rate_limits': rate_limits_str,
                 'provider_api_access': 'https://console.groq.com/keys',
-                'created_at': self.format_timestamp(model.get('created'), timestamp_patterns),
+                'created_at': self.format_timestamp(model.get('created'), timestamp_patterns, current_timestamp),
                 'updated_at': current_timestamp
             }
 
@@ -631,7 +632,7 @@ if __name__ == "__main__":
     # Test modality processing
     print("\nTesting modality processing...")
     test_modalities = ['text', 'audio']
-    standardized = processor.standardize_modalities(test_modalities, {"text": "Text", "audio": "Audio"})
+    standardized = processor.standardize_and_sort_modalities(test_modalities, {"text": "Text", "audio": "Audio"}, ordering)
     print(f"Standardized modalities: {test_modalities} → {standardized}")
 
     print("\n✓ Data processor test completed")
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Groq Pipeline HTTP Utilities
+===========================
+
+Shared rate limiting and keep-alive sessions for the HuggingFace
+lookups in the license extraction scripts.
+
+Features:
+- Token bucket rate limiter shared across fetch threads
+- Retry-After handling for HTTP 429 responses
+- Keep-alive session factory without transport-level retries
+
+Author: AI Models Discovery Pipeline
+Version: 1.0
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class RateLimiter:
+    """Token bucket shared by all fetch threads to cap the HuggingFace request rate"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every fetch thread for the given time, e.g. after HF answers 429"""
+        with self.lock:
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+def get_retry_after(response: requests.Response, default: float) -> float:
+    """Seconds to wait before retrying, from the Retry-After header when HF sends one"""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After', default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def create_http_session(pool_connections: int = 1, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Create a keep-alive session with a connection pool sized for the fetch threads
+
+    Transport-level retries are disabled: callers retry in their own loops,
+    so every attempt goes through their rate limiter.
+    """
+    session = requests.Session()
+    # Add headers to mimic browser request
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -5,19 +5,30 @@ Filters models from A-fetched-api-models.json for free models only
 """
 import json
 import os
+import re
 import sys
+from collections import defaultdict
+from operator import itemgetter
 from datetime import datetime
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Errors iter_models_from_json can raise part-way through the stream
+MODEL_STREAM_ERRORS = (IOError, ijson.JSONError) if IJSON_AVAILABLE else (IOError,)
 
 # Import output utilities
-import sys; import os; sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils")); from output_utils import get_output_file_path, get_input_file_path, ensure_output_dir_exists, get_ist_timestamp
+import sys; import os; sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils")); from output_utils import get_output_file_path, get_input_file_path, ensure_output_dir_exists, get_ist_timestamp, read_json_file, write_json_file, seek_json_models_prefix
 
 def load_filtering_config() -> Dict[str, Any]:
     """Load filtering configuration from JSON file"""
     config_file = "../03_configs/02_models_filtering_rules.json"
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = read_json_file(config_file)
         print(f"✓ Loaded filtering rules from: {config_file}")
         return config
     except (FileNotFoundError, json.JSONDecodeError) as error:
@@ -39,8 +50,7 @@ def load_models_from_json(filename: str) -> List[Dict[str, Any]]:
             print(f"ERROR: Input file not found: {filename}")
             return []
             
-        with open(filename, 'r', encoding='utf-8') as json_file:
-            data = json.load(json_file)
+        data = read_json_file(filename)
 
         # Handle both old format (list) and new format (dict with metadata)
         if isinstance(data, list):
@@ -58,12 +68,83 @@ def load_models_from_json(filename: str) -> List[Dict[str, Any]]:
         print(f"ERROR: Failed to load models from {filename}: {error}")
         return []
 
-def filter_models(models: List[Dict[str, Any]], config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Tuple[str, str]]]]:
+def iter_models_from_json(filename: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream models from JSON file one at a time
+
+    With ijson installed, models are parsed incrementally so callers can drop
+    rejected models without holding the whole array in memory. Otherwise
+    falls back to load_models_from_json.
+
+    Args:
+        filename: Input JSON filename
+
+    Yields:
+        Model dictionaries
+
+    Raises:
+        One of MODEL_STREAM_ERRORS if the file cannot be read or parsed
+    """
+    if not IJSON_AVAILABLE:
+        yield from load_models_from_json(filename)
+        return
+
+    if not os.path.exists(filename):
+        print(f"ERROR: Input file not found: {filename}")
+        return
+
+    with open(filename, 'rb') as json_file:
+        # Handle both old format (list) and new format (dict with metadata)
+        prefix = seek_json_models_prefix(json_file)
+        yield from ijson.items(json_file, prefix, use_float=True)
+
+def compile_keyword_scanner(keywords_lc: List[str]) -> Optional[re.Pattern]:
+    """
+    Compile lowercase keywords into one alternation regex
+
+    A single search over the text detects whether any keyword occurs, instead
+    of one substring scan per keyword.
+
+    Args:
+        keywords_lc: Lowercased keywords
+
+    Returns:
+        Compiled pattern, or None if there are no keywords
+    """
+    keywords_lc = [keyword for keyword in keywords_lc if keyword]
+    if not keywords_lc:
+        return None
+    return re.compile('|'.join(map(re.escape, keywords_lc)))
+
+def first_matching_keyword(text: str, keywords_lc: List[Tuple[str, str]],
+                           scanner: Optional[re.Pattern]) -> Optional[str]:
+    """
+    Return the first keyword, in priority order, contained in text
+
+    The scanner rejects non-matching text in one pass; only on a hit are the
+    keywords walked in priority order to pick the reported keyword.
+
+    Args:
+        text: Lowercased text to search
+        keywords_lc: (original, lowercased) keyword pairs in priority order
+        scanner: Pattern from compile_keyword_scanner
+
+    Returns:
+        Original keyword, or None if no keyword matches
+    """
+    if scanner is None or not scanner.search(text):
+        return None
+    for keyword, keyword_lc in keywords_lc:
+        if keyword_lc and keyword_lc in text:
+            return keyword
+    return None
+
+def filter_models(models: Iterable[Dict[str, Any]], config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Tuple[str, str]]]]:
     """
     Filter models using sequential filtering steps
 
     Args:
-        models: List of all models
+        models: Iterable of all models; consumed in a single pass
         config: Filtering configuration from 02_models_filtering_rules.json
 
     Returns:
@@ -75,6 +156,15 @@ def filter_models(models: List[Dict[str, Any]], config: Dict[str, Any]) -> Tuple
     exclude_reasons = config.get('exclude_reasons', {})
     dedup_rules = config.get('deduplication_rules', {})
 
+    # Lowercase keywords once; keep the original spelling for exclusion reasons
+    billing_keywords_lc = [(keyword, keyword.lower()) for keyword in billing_keywords]
+    # Exclude keywords are tried longest first so the most specific reason wins;
+    # the sort is stable, so equal-length keywords keep their config order
+    exclude_keywords_lc = sorted(((keyword, keyword.lower()) for keyword in exclude_keywords),
+                                 key=lambda pair: len(pair[1]), reverse=True)
+    billing_scanner = compile_keyword_scanner([lc for _, lc in billing_keywords_lc])
+    exclude_scanner = compile_keyword_scanner([lc for _, lc in exclude_keywords_lc])
+
     # Initialize tracking for each step
     excluded_by_step = {
         'step1_pricing': [],
@@ -83,77 +173,70 @@ def filter_models(models: List[Dict[str, Any]], config: Dict[str, Any]) -> Tuple
         'step4_deduplication': []
     }
 
-    print(f"Starting sequential filtering with {len(models)} total models")
+    print("Starting sequential filtering")
+
+    # Resolve the criteria once and compare each model's prices as one tuple
+    free_pricing = (free_criteria.get('pricing_prompt', 'Unknown'),
+                    free_criteria.get('pricing_completion', 'Unknown'),
+                    free_criteria.get('pricing_request', 'Unknown'))
+    billing_required_reason = exclude_reasons.get('billing_required', 'Requires billing/payment')
+    billing_description_reason = exclude_reasons.get('billing_in_description', 'Description indicates billing requirements')
+
+    # STEPS 1-3 run in a single pass; each model stops at the first step that rejects it
+    step1_pricing_excluded = excluded_by_step['step1_pricing']
+    step2_billing_excluded = excluded_by_step['step2_billing']
+    step3_keywords_excluded = excluded_by_step['step3_keywords']
+    step1_passed_count = 0
+    step2_passed_count = 0
+    step3_passed = []
 
-    # STEP 1: Free model criteria (pricing check)
-    step1_passed = []
     for model in models:
         model_name = model.get('name', '')
-        pricing = model.get('pricing', {})
-        prompt_price = pricing.get('prompt', '0')
-        completion_price = pricing.get('completion', '0')
-        request_price = pricing.get('request', '0')
-
-        is_free = (prompt_price == free_criteria.get('pricing_prompt', 'Unknown') and
-                   completion_price == free_criteria.get('pricing_completion', 'Unknown') and
-                   request_price == free_criteria.get('pricing_request', 'Unknown'))
-
-        if is_free:
-            step1_passed.append(model)
-        else:
-            excluded_by_step['step1_pricing'].append((model_name, exclude_reasons.get('billing_required', 'Requires billing/payment')))
-
-    print(f"Step 1 (Pricing): {len(step1_passed)} models passed, {len(excluded_by_step['step1_pricing'])} excluded")
 
-    # STEP 2: Billing description check
-    step2_passed = []
-    for model in step1_passed:
-        model_name = model.get('name', '')
+        # STEP 1: Free model criteria (pricing check)
+        pricing = model.get('pricing', {})
+        model_pricing = (pricing.get('prompt', '0'),
+                         pricing.get('completion', '0'),
+                         pricing.get('request', '0'))
+        if model_pricing != free_pricing:
+            step1_pricing_excluded.append((model_name, billing_required_reason))
+            continue
+        step1_passed_count += 1
+
+        # STEP 2: Billing description check
         description = model.get('description', '').lower()
-
-        has_billing_requirement = False
-        for billing_keyword in billing_keywords:
-            if billing_keyword.lower() in description:
-                excluded_by_step['step2_billing'].append((model_name, f"{exclude_reasons.get('billing_in_description', 'Description indicates billing requirements')}: '{billing_keyword}'"))
-                has_billing_requirement = True
-                break
-
-        if not has_billing_requirement:
-            step2_passed.append(model)
-
-    print(f"Step 2 (Billing): {len(step2_passed)} models passed, {len(excluded_by_step['step2_billing'])} excluded")
-
-    # STEP 3: Keyword exclusion
-    step3_passed = []
-    for model in step2_passed:
-        model_name = model.get('name', '')
-        model_name_lower = model_name.lower()
-
-        excluded_for_keyword = False
-        for keyword in exclude_keywords:
-            if keyword.lower() in model_name_lower:
-                reason = exclude_reasons.get(keyword, f'Contains excluded keyword: {keyword}')
-                excluded_by_step['step3_keywords'].append((model_name, reason))
-                excluded_for_keyword = True
-                break
-
-        if not excluded_for_keyword:
-            step3_passed.append(model)
-
-    print(f"Step 3 (Keywords): {len(step3_passed)} models passed, {len(excluded_by_step['step3_keywords'])} excluded")
+        billing_keyword = first_matching_keyword(description, billing_keywords_lc, billing_scanner)
+        if billing_keyword is not None:
+            step2_billing_excluded.append((model_name, f"{billing_description_reason}: '{billing_keyword}'"))
+            continue
+        step2_passed_count += 1
+
+        # STEP 3: Keyword exclusion
+        keyword = first_matching_keyword(model_name.lower(), exclude_keywords_lc, exclude_scanner)
+        if keyword is not None:
+            reason = exclude_reasons.get(keyword, f'Contains excluded keyword: {keyword}')
+            step3_keywords_excluded.append((model_name, reason))
+            continue
+        step3_passed.append(model)
+
+    print(f"Step 1 (Pricing): {step1_passed_count} models passed, {len(step1_pricing_excluded)} excluded")
+    print(f"Step 2 (Billing): {step2_passed_count} models passed, {len(step2_billing_excluded)} excluded")
+    print(f"Step 3 (Keywords): {len(step3_passed)} models passed, {len(step3_keywords_excluded)} excluded")
+
+    # Nothing left to deduplicate
+    if not step3_passed:
+        print("Step 4 (Deduplication): Skipped (no models passed Steps 1-3)")
+        return [], excluded_by_step
 
     # STEP 4: Deduplication after (free) suffix normalization
     step4_passed = []
     if dedup_rules.get('enabled', False) and dedup_rules.get('remove_duplicates_after_free_suffix_strip', False):
         # Group models by normalized name (after stripping (free))
-        normalized_groups = {}
+        normalized_groups = defaultdict(list)
         for model in step3_passed:
             model_name = model.get('name', '')
             # Normalize by stripping (free) suffix
             normalized_name = model_name.replace(' (free)', '').strip()
-
-            if normalized_name not in normalized_groups:
-                normalized_groups[normalized_name] = []
             normalized_groups[normalized_name].append(model)
 
         # Process each group - keep only one if duplicates exist
@@ -221,227 +304,234 @@ def save_filtered_models(models: List[Dict[str, Any]], filename: str) -> bool:
             "models": models
         }
 
-        with open(filename, 'w', encoding='utf-8') as json_file:
-            json.dump(output_data, json_file, indent=2)
+        write_json_file(output_data, filename)
         print(f"✓ Filtered models saved to: {filename}")
         return True
     except (IOError, TypeError) as error:
         print(f"ERROR: Failed to save filtered models to {filename}: {error}")
         return False
 
-def generate_filter_report(all_models: List[Dict[str, Any]],
+def generate_filter_report(total_models: int,
                           filtered_models: List[Dict[str, Any]],
                           excluded_by_step: Dict[str, List[Tuple[str, str]]],
-                          filename: str) -> bool:
+                          filename: str,
+                          include_model_listing: bool = True) -> bool:
     """
     Generate report of sequential filtering results
 
     Args:
-        all_models: List of all models
+        total_models: Number of models read from input
         filtered_models: List of filtered models
         excluded_by_step: Dict with excluded models by filtering step
         filename: Output filename
+        include_model_listing: Whether to list every filtered model by provider
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        with open(filename, 'w', encoding='utf-8') as report_file:
-            # Header
-            report_file.write("=" * 80 + "\n")
-            report_file.write("OPENROUTER MODELS SEQUENTIAL FILTER REPORT\n")
-            report_file.write(f"Generated: {get_ist_timestamp()}\n")
-            report_file.write("=" * 80 + "\n\n")
-
-            # Calculate totals
-            total_excluded = sum(len(excluded_list) for excluded_list in excluded_by_step.values())
-
-            # Summary
-            report_file.write(f"SEQUENTIAL FILTERING SUMMARY:\n")
-            report_file.write(f"  Total models processed: {len(all_models)}\n")
-            report_file.write(f"  Models passed all filters: {len(filtered_models)}\n")
-            report_file.write(f"  Models excluded: {total_excluded}\n")
-
-            if all_models:
-                pass_percentage = (len(filtered_models) / len(all_models)) * 100
-                report_file.write(f"  Success rate: {pass_percentage:.1f}%\n\n")
-            else:
-                report_file.write("\n")
-
-            # Step-by-step breakdown
-            report_file.write(f"STEP-BY-STEP FILTERING BREAKDOWN:\n")
-            models_remaining = len(all_models)
-
-            # Step 1: Pricing Filter
-            step1_excluded = len(excluded_by_step['step1_pricing'])
-            models_remaining -= step1_excluded
-            report_file.write(f"  Step 1 - Free Pricing Filter:\n")
-            report_file.write(f"    Input: {len(all_models)} models\n")
-            report_file.write(f"    Excluded: {step1_excluded} models (non-free pricing)\n")
-            report_file.write(f"    Remaining: {models_remaining} models\n\n")
-
-            # Step 2: Billing Description Filter
-            step2_excluded = len(excluded_by_step['step2_billing'])
-            models_remaining -= step2_excluded
-            report_file.write(f"  Step 2 - Billing Description Filter:\n")
-            report_file.write(f"    Input: {models_remaining + step2_excluded} models\n")
-            report_file.write(f"    Excluded: {step2_excluded} models (billing requirements in description)\n")
-            report_file.write(f"    Remaining: {models_remaining} models\n\n")
-
-            # Step 3: Keyword Filter
-            step3_excluded = len(excluded_by_step['step3_keywords'])
-            models_remaining -= step3_excluded
-            report_file.write(f"  Step 3 - Keyword Filter:\n")
-            report_file.write(f"    Input: {models_remaining + step3_excluded} models\n")
-            report_file.write(f"    Excluded: {step3_excluded} models (preview/experimental/beta)\n")
-            report_file.write(f"    Remaining: {models_remaining} models\n\n")
-
-            # Step 4: Deduplication Filter
-            step4_excluded = len(excluded_by_step['step4_deduplication'])
-            models_remaining -= step4_excluded
-            report_file.write(f"  Step 4 - Deduplication Filter:\n")
-            report_file.write(f"    Input: {models_remaining + step4_excluded} models\n")
-            report_file.write(f"    Excluded: {step4_excluded} models (duplicates after (free) suffix normalization)\n")
-            report_file.write(f"    Final: {models_remaining} models\n\n")
-
-            # Step 1 Summary (no details as requested)
-            report_file.write("=" * 80 + "\n")
-            report_file.write("STEP 1 - FREE PRICING FILTER RESULTS\n")
-            report_file.write("=" * 80 + "\n")
-            report_file.write(f"Excluded {step1_excluded} models with non-free pricing (details omitted due to volume)\n\n")
-
-            # Step 2 Detailed Results (as requested)
-            report_file.write("=" * 80 + "\n")
-            report_file.write("STEP 2 - BILLING DESCRIPTION FILTER RESULTS (DETAILED)\n")
-            report_file.write("=" * 80 + "\n")
-
-            if excluded_by_step['step2_billing']:
-                report_file.write(f"Found {step2_excluded} models with billing requirements in description:\n\n")
-
-                for i, (model_name, reason) in enumerate(excluded_by_step['step2_billing'], 1):
-                    report_file.write(f"  {i:2d}. {model_name}\n")
-                    report_file.write(f"      Reason: {reason}\n\n")
-            else:
-                report_file.write("No models found with billing requirements in description.\n\n")
-
-            # Step 3 Detailed Results
-            report_file.write("=" * 80 + "\n")
-            report_file.write("STEP 3 - KEYWORD FILTER RESULTS (DETAILED)\n")
-            report_file.write("=" * 80 + "\n")
-
-            if excluded_by_step['step3_keywords']:
-                # Group by reason for better organization
-                keyword_groups = {}
-                for model_name, reason in excluded_by_step['step3_keywords']:
-                    if reason not in keyword_groups:
-                        keyword_groups[reason] = []
-                    keyword_groups[reason].append(model_name)
-
-                for reason in sorted(keyword_groups.keys()):
-                    models = keyword_groups[reason]
-                    report_file.write(f"EXCLUDED FOR: {reason.upper()} ({len(models)} models)\n")
-                    report_file.write("-" * 50 + "\n")
-
-                    for i, model_name in enumerate(sorted(models), 1):
-                        report_file.write(f"  {i:2d}. {model_name}\n")
-
-                    report_file.write("\n")
-            else:
-                report_file.write("No models excluded for keywords.\n\n")
+        lines = []
+
+        # Header
+        lines.append("=" * 80 + "\n")
+        lines.append("OPENROUTER MODELS SEQUENTIAL FILTER REPORT\n")
+        lines.append(f"Generated: {get_ist_timestamp()}\n")
+        lines.append("=" * 80 + "\n\n")
+
+        # Calculate totals
+        passed_count = len(filtered_models)
+        step1_excluded = len(excluded_by_step['step1_pricing'])
+        step2_excluded = len(excluded_by_step['step2_billing'])
+        step3_excluded = len(excluded_by_step['step3_keywords'])
+        step4_excluded = len(excluded_by_step['step4_deduplication'])
+        total_excluded = step1_excluded + step2_excluded + step3_excluded + step4_excluded
+
+        # Summary
+        lines.append(f"SEQUENTIAL FILTERING SUMMARY:\n")
+        lines.append(f"  Total models processed: {total_models}\n")
+        lines.append(f"  Models passed all filters: {passed_count}\n")
+        lines.append(f"  Models excluded: {total_excluded}\n")
+
+        if total_models:
+            pass_percentage = (passed_count / total_models) * 100
+            lines.append(f"  Success rate: {pass_percentage:.1f}%\n\n")
+        else:
+            lines.append("\n")
+
+        # Step-by-step breakdown
+        lines.append(f"STEP-BY-STEP FILTERING BREAKDOWN:\n")
+        models_remaining = total_models
+
+        # Step 1: Pricing Filter
+        models_remaining -= step1_excluded
+        lines.append(f"  Step 1 - Free Pricing Filter:\n")
+        lines.append(f"    Input: {total_models} models\n")
+        lines.append(f"    Excluded: {step1_excluded} models (non-free pricing)\n")
+        lines.append(f"    Remaining: {models_remaining} models\n\n")
+
+        # Step 2: Billing Description Filter
+        models_remaining -= step2_excluded
+        lines.append(f"  Step 2 - Billing Description Filter:\n")
+        lines.append(f"    Input: {models_remaining + step2_excluded} models\n")
+        lines.append(f"    Excluded: {step2_excluded} models (billing requirements in description)\n")
+        lines.append(f"    Remaining: {models_remaining} models\n\n")
+
+        # Step 3: Keyword Filter
+        models_remaining -= step3_excluded
+        lines.append(f"  Step 3 - Keyword Filter:\n")
+        lines.append(f"    Input: {models_remaining + step3_excluded} models\n")
+        lines.append(f"    Excluded: {step3_excluded} models (preview/experimental/beta)\n")
+        lines.append(f"    Remaining: {models_remaining} models\n\n")
+
+        # Step 4: Deduplication Filter
+        models_remaining -= step4_excluded
+        lines.append(f"  Step 4 - Deduplication Filter:\n")
+        lines.append(f"    Input: {models_remaining + step4_excluded} models\n")
+        lines.append(f"    Excluded: {step4_excluded} models (duplicates after (free) suffix normalization)\n")
+        lines.append(f"    Final: {models_remaining} models\n\n")
+
+        # Step 1 Summary (no details as requested)
+        lines.append("=" * 80 + "\n")
+        lines.append("STEP 1 - FREE PRICING FILTER RESULTS\n")
+        lines.append("=" * 80 + "\n")
+        lines.append(f"Excluded {step1_excluded} models with non-free pricing (details omitted due to volume)\n\n")
+
+        # Step 2 Detailed Results (as requested)
+        lines.append("=" * 80 + "\n")
+        lines.append("STEP 2 - BILLING DESCRIPTION FILTER RESULTS (DETAILED)\n")
+        lines.append("=" * 80 + "\n")
+
+        if excluded_by_step['step2_billing']:
+            lines.append(f"Found {step2_excluded} models with billing requirements in description:\n\n")
+
+            for i, (model_name, reason) in enumerate(excluded_by_step['step2_billing'], 1):
+                lines.append(f"  {i:2d}. {model_name}\n")
+                lines.append(f"      Reason: {reason}\n\n")
+        else:
+            lines.append("No models found with billing requirements in description.\n\n")
 
-            # Step 4 Detailed Results
-            report_file.write("=" * 80 + "\n")
-            report_file.write("STEP 4 - DEDUPLICATION FILTER RESULTS (DETAILED)\n")
-            report_file.write("=" * 80 + "\n")
+        # Step 3 Detailed Results
+        lines.append("=" * 80 + "\n")
+        lines.append("STEP 3 - KEYWORD FILTER RESULTS (DETAILED)\n")
+        lines.append("=" * 80 + "\n")
 
-            if excluded_by_step['step4_deduplication']:
-                report_file.write(f"Found {step4_excluded} duplicate models after (free) suffix normalization:\n\n")
+        if excluded_by_step['step3_keywords']:
+            # Group by reason for better organization
+            keyword_groups = defaultdict(list)
+            for model_name, reason in excluded_by_step['step3_keywords']:
+                keyword_groups[reason].append(model_name)
 
-                for i, (model_name, reason) in enumerate(excluded_by_step['step4_deduplication'], 1):
-                    report_file.write(f"  {i:2d}. {model_name}\n")
-                    report_file.write(f"      Reason: {reason}\n\n")
+            for reason in sorted(keyword_groups.keys()):
+                models = keyword_groups[reason]
+                lines.append(f"EXCLUDED FOR: {reason.upper()} ({len(models)} models)\n")
+                lines.append("-" * 50 + "\n")
+
+                for i, model_name in enumerate(sorted(models), 1):
+                    lines.append(f"  {i:2d}. {model_name}\n")
+
+                lines.append("\n")
+        else:
+            lines.append("No models excluded for keywords.\n\n")
+
+        # Step 4 Detailed Results
+        lines.append("=" * 80 + "\n")
+        lines.append("STEP 4 - DEDUPLICATION FILTER RESULTS (DETAILED)\n")
+        lines.append("=" * 80 + "\n")
+
+        if excluded_by_step['step4_deduplication']:
+            lines.append(f"Found {step4_excluded} duplicate models after (free) suffix normalization:\n\n")
+
+            for i, (model_name, reason) in enumerate(excluded_by_step['step4_deduplication'], 1):
+                lines.append(f"  {i:2d}. {model_name}\n")
+                lines.append(f"      Reason: {reason}\n\n")
+        else:
+            lines.append("No duplicate models found.\n\n")
+
+        # Final filtered models organized by provider
+        if include_model_listing:
+            lines.append("=" * 80 + "\n")
+            lines.append("FINAL FILTERED MODELS (PASSED ALL FILTERS)\n")
+            lines.append("=" * 80 + "\n\n")
+
+        # Organize filtered models by provider
+        providers = defaultdict(list)
+        for model in filtered_models:
+            name = model.get('name', '')
+            model_id = model.get('id', '')
+
+            # Extract provider from name (before colon) or from ID
+            name_provider, separator, name_remainder = name.partition(': ')
+            if separator:
+                provider = name_provider.strip()
+                model_display_name = name_remainder.strip()
             else:
-                report_file.write("No duplicate models found.\n\n")
-
-            # Final filtered models organized by provider
-            report_file.write("=" * 80 + "\n")
-            report_file.write("FINAL FILTERED MODELS (PASSED ALL FILTERS)\n")
-            report_file.write("=" * 80 + "\n\n")
-
-            # Organize filtered models by provider
-            providers = {}
-            for model in filtered_models:
-                name = model.get('name', '')
-                model_id = model.get('id', '')
-
-                # Extract provider from name (before colon) or from ID
-                if ': ' in name:
-                    provider = name.split(': ', 1)[0].strip()
-                    model_display_name = name.split(': ', 1)[1].strip()
+                # Fallback: extract provider from model ID
+                if '/' in model_id:
+                    provider = model_id.split('/', 1)[0]
+                    model_display_name = name or model_id
                 else:
-                    # Fallback: extract provider from model ID
-                    if '/' in model_id:
-                        provider = model_id.split('/', 1)[0]
-                        model_display_name = name or model_id
-                    else:
-                        provider = "Unknown"
-                        model_display_name = name or model_id
-
-                if provider not in providers:
-                    providers[provider] = []
-                providers[provider].append({
-                    'id': model_id,
-                    'name': name,
-                    'display_name': model_display_name,
-                    'pricing': model.get('pricing', {}),
-                    'description': model.get('description', '')
-                })
-
-            # Sort providers by count (descending order)
-            sorted_providers = sorted(providers.items(), key=lambda x: len(x[1]), reverse=True)
-
-            # Report filtered models by provider
-            total_models_listed = 0
+                    provider = "Unknown"
+                    model_display_name = name or model_id
+
+            providers[provider].append({
+                'id': model_id,
+                'name': name,
+                'display_name': model_display_name,
+                'display_name_lc': model_display_name.lower(),
+                'pricing': model.get('pricing', {})
+            })
+
+        # Sort providers by count (descending order)
+        sorted_providers = sorted(providers.items(), key=lambda x: len(x[1]), reverse=True)
+
+        # Report filtered models by provider (omitted for summary-only reports)
+        total_models_listed = 0
+        if include_model_listing:
             for provider, models in sorted_providers:
-                report_file.write(f"PROVIDER: {provider.upper()} ({len(models)} models)\n")
-                report_file.write("-" * 50 + "\n")
+                lines.append(f"PROVIDER: {provider.upper()} ({len(models)} models)\n")
+                lines.append("-" * 50 + "\n")
 
                 # Sort models within provider
-                sorted_models = sorted(models, key=lambda x: x['display_name'].lower())
+                sorted_models = sorted(models, key=itemgetter('display_name_lc'))
 
                 for i, model in enumerate(sorted_models, 1):
                     model_id = model['id']
                     model_name = model['name']
                     pricing = model['pricing']
 
-                    report_file.write(f"  {i:2d}. {model_name}\n")
-                    report_file.write(f"      ID: {model_id}\n")
+                    lines.append(f"  {i:2d}. {model_name}\n")
+                    lines.append(f"      ID: {model_id}\n")
 
                     # Show pricing info
                     prompt_price = pricing.get('prompt', 'N/A')
                     completion_price = pricing.get('completion', 'N/A')
                     request_price = pricing.get('request', 'N/A')
-                    report_file.write(f"      Pricing: prompt={prompt_price}, completion={completion_price}, request={request_price}\n")
-                    report_file.write("\n")
+                    lines.append(f"      Pricing: prompt={prompt_price}, completion={completion_price}, request={request_price}\n")
+                    lines.append("\n")
 
                 total_models_listed += len(models)
-                report_file.write("\n")
-
-            # Final Summary
-            report_file.write("=" * 80 + "\n")
-            report_file.write(f"FINAL SUMMARY:\n")
-            report_file.write(f"  Total providers: {len(providers)}\n")
-            report_file.write(f"  Total models passed all filters: {len(filtered_models)}\n")
-            report_file.write(f"  Models excluded by pricing: {step1_excluded}\n")
-            report_file.write(f"  Models excluded by billing description: {step2_excluded}\n")
-            report_file.write(f"  Models excluded by keywords: {step3_excluded}\n")
-            report_file.write(f"  Models excluded by deduplication: {step4_excluded}\n")
-            report_file.write(f"  Total exclusions: {total_excluded}\n")
-
-            if total_models_listed != len(filtered_models):
-                report_file.write(f"  ⚠️  MISMATCH: {len(filtered_models) - total_models_listed} models missing from report\n")
-            else:
-                report_file.write(f"  ✓ All filtered models accounted for\n")
+                lines.append("\n")
+
+        # Final Summary
+        lines.append("=" * 80 + "\n")
+        lines.append(f"FINAL SUMMARY:\n")
+        lines.append(f"  Total providers: {len(providers)}\n")
+        lines.append(f"  Total models passed all filters: {passed_count}\n")
+        lines.append(f"  Models excluded by pricing: {step1_excluded}\n")
+        lines.append(f"  Models excluded by billing description: {step2_excluded}\n")
+        lines.append(f"  Models excluded by keywords: {step3_excluded}\n")
+        lines.append(f"  Models excluded by deduplication: {step4_excluded}\n")
+        lines.append(f"  Total exclusions: {total_excluded}\n")
+
+        if not include_model_listing:
+            lines.append(f"  Per-model listing omitted (set B_REPORT_VERBOSE=1 to include it)\n")
+        elif total_models_listed != passed_count:
+            lines.append(f"  ⚠️  MISMATCH: {passed_count - total_models_listed} models missing from report\n")
+        else:
+            lines.append(f"  ✓ All filtered models accounted for\n")
+
+        with open(filename, 'w', encoding='utf-8') as report_file:
+            report_file.write(''.join(lines))
 
         print(f"✓ Sequential filter report saved to: {filename}")
         return True
@@ -467,15 +557,20 @@ def main():
     output_filename = get_output_file_path("B-filtered-models.json")
     report_filename = get_output_file_path("B-filtered-models-report.txt")
 
-    # Load all models
-    all_models = load_models_from_json(input_filename)
-    
-    if not all_models:
+    # Stream models straight into sequential filtering
+    try:
+        filtered_models, excluded_by_step = filter_models(iter_models_from_json(input_filename), config)
+    except MODEL_STREAM_ERRORS as error:
+        print(f"ERROR: Failed to stream models from {input_filename}: {error}")
+        return False
+
+    # Every input model either passes or is excluded by exactly one step
+    total_excluded = sum(len(excluded_list) for excluded_list in excluded_by_step.values())
+    total_models = len(filtered_models) + total_excluded
+
+    if not total_models:
         print("No models loaded from input file")
         return False
-    
-    # Filter models using sequential filtering
-    filtered_models, excluded_by_step = filter_models(all_models, config)
 
     if not filtered_models:
         print("No models passed the filters")
@@ -485,13 +580,15 @@ def main():
     save_success = save_filtered_models(filtered_models, output_filename)
 
     # Generate filter report
-    report_success = generate_filter_report(all_models, filtered_models, excluded_by_step, report_filename)
+    # B_REPORT_VERBOSE=0 writes a summary-only report; the JSON output is unaffected
+    include_model_listing = os.getenv('B_REPORT_VERBOSE', '1').lower() not in ('0', 'false', 'no')
+    report_success = generate_filter_report(total_models, filtered_models, excluded_by_step, report_filename,
+                                            include_model_listing)
 
     if save_success and report_success:
-        total_excluded = sum(len(excluded_list) for excluded_list in excluded_by_step.values())
         print("="*60)
         print("FILTERING COMPLETE")
-        print(f"Input: {len(all_models)} total models")
+        print(f"Input: {total_models} total models")
         print(f"Output: {len(filtered_models)} filtered models")
         print(f"Excluded: {total_excluded} models")
         print(f"  Step 1 (Pricing): {len(excluded_by_step['step1_pricing'])} excluded")
@@ -10,27 +10,38 @@ import json
 import sys
 import os
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 from datetime import datetime
 import requests
 
 # Import output utilities
-import sys; import os; sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils")); from output_utils import get_output_file_path, get_input_file_path, ensure_output_dir_exists, get_ist_timestamp
+import sys; import os; sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils")); from output_utils import get_output_file_path, get_input_file_path, ensure_output_dir_exists, get_ist_timestamp, read_json_file, write_json_file
+from http_utils import RateLimiter, get_retry_after, create_http_session
+
+# Concurrent URL probing, capped to a polite request rate across all threads
+MAX_FETCH_WORKERS = 8
+HF_REQUESTS_PER_SECOND = 5
+
+HF_RATE_LIMITER = RateLimiter(HF_REQUESTS_PER_SECOND, HF_REQUESTS_PER_SECOND)
+
+# Shared by all probe threads so TCP/TLS connections to huggingface.co are reused
+HTTP_SESSION = create_http_session()
 
 
 def check_url_accessible(url: str, max_retries: int = 2) -> bool:
     """Check if a URL is accessible with a HEAD request, with retry logic for rate limiting"""
     for attempt in range(max_retries):
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.head(url, timeout=5, allow_redirects=True, headers=headers)
+            HF_RATE_LIMITER.acquire()
+            response = HTTP_SESSION.head(url, timeout=5, allow_redirects=True)
 
             if response.status_code == 429:
                 if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 3  # 3, 6 seconds
-                    time.sleep(wait_time)
+                    wait_time = get_retry_after(response, (attempt + 1) * 3)  # default 3, 6 seconds
+                    # Pause the shared limiter so other threads back off too; acquire() waits it out
+                    HF_RATE_LIMITER.pause(wait_time)
                     continue
                 return False
 
@@ -80,8 +91,7 @@ def load_models_data() -> List[Dict[str, Any]]:
     input_file = get_input_file_path('B-filtered-models.json')
     
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json_file(input_file)
 
         # Handle both old format (list) and new format (dict with metadata)
         if isinstance(data, list):
@@ -113,8 +123,8 @@ def process_models_for_license_info(models: List[Dict[str, Any]]) -> List[Dict[s
     
     print(f"Processing {len(models)} models for license info URLs...")
     
-    for i, model in enumerate(models, 1):
-        primary_key = model.get('canonical_slug', '')  # Primary identifier
+    target_models = []
+    for model in models:
         name = model.get('name', '')                   # Practical for skip detection
         hf_id = model.get('hugging_face_id', '')       # Practical for HF API calls
         
@@ -126,15 +136,22 @@ def process_models_for_license_info(models: List[Dict[str, Any]]) -> List[Dict[s
         if not hf_id:
             continue
         
-        # Get license info URL using 3-tier priority system
-        license_info_url = get_huggingface_license_info(hf_id)
-        
+        target_models.append(model)
+    
+    # Several OpenRouter slugs can share one HF repo; probe each repo once
+    unique_hf_ids = list(dict.fromkeys(model['hugging_face_id'] for model in target_models))
+    
+    # Get license info URLs using 3-tier priority system, probing repos concurrently
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        license_info_urls = dict(zip(unique_hf_ids, executor.map(get_huggingface_license_info, unique_hf_ids)))
+    
+    for model in target_models:
         processed_model = {
             'id': model.get('id', ''),
-            'canonical_slug': primary_key,             # Primary identifier
-            'name': name,
-            'hugging_face_id': hf_id,
-            'license_info_url': license_info_url
+            'canonical_slug': model.get('canonical_slug', ''),  # Primary identifier
+            'name': model.get('name', ''),
+            'hugging_face_id': model['hugging_face_id'],
+            'license_info_url': license_info_urls[model['hugging_face_id']]
         }
         
         processed_models.append(processed_model)
@@ -157,92 +174,93 @@ def save_license_info_json(processed_models: List[Dict[str, str]]) -> str:
             "models": processed_models
         }
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2)
+        write_json_file(output_data, output_file)
         print(f"✓ Saved license info to: {output_file}")
         return output_file
     except (IOError, TypeError) as error:
         print(f"ERROR: Failed to save to {output_file}: {error}")
         return ""
 
+def categorize_license_info_url(url: str) -> str:
+    """Classify a license info URL for the report breakdown"""
+    if url.startswith('https://huggingface.co/') and '/blob/main/LICENSE' in url:
+        return 'LICENSE file'
+    elif url.startswith('https://huggingface.co/') and '/blob/main/README.md' in url:
+        return 'README.md file'
+    elif url.startswith('https://huggingface.co/') and url.count('/') == 3:
+        return 'Base repository'
+    elif url == 'Unknown':
+        return 'Unknown/Inaccessible'
+    return 'Other'
+
 def generate_license_info_report(processed_models: List[Dict[str, str]]) -> str:
     """Generate human-readable report"""
     report_file = get_output_file_path('E-other-license-info-urls-from-hf-report.txt')
+    lines = []
+
+    # Header
+    lines.append("=" * 80 + "\n")
+    lines.append("OTHER LICENSE INFO URLS REPORT\n")
+    lines.append(f"Generated: {get_ist_timestamp()}\n")
+    lines.append("=" * 80 + "\n\n")
+    
+    # Summary
+    lines.append(f"SUMMARY:\n")
+    lines.append(f"  Total models : {len(processed_models)}\n")
+    lines.append(f"  Input        : B-filtered-models.json\n")
+    lines.append(f"  Processor    : E_fetch_other_license_info_urls_from_hf.py\n")
+    lines.append(f"  Output       : E-other-license-info-urls-from-hf.json\n\n")
+    
+    # URL Status Statistics
+    url_stats = Counter(categorize_license_info_url(model.get('license_info_url', 'Unknown'))
+                        for model in processed_models)
     
+    lines.append(f"LICENSE INFO URL BREAKDOWN:\n")
+    # Sort by count descending, then by category name
+    sorted_categories = sorted(url_stats.items(), key=lambda x: (-x[1], x[0]))
+    for category, count in sorted_categories:
+        lines.append(f"  {count:2d} models: {category}\n")
+    lines.append(f"\nTotal categories: {len(url_stats)}\n\n")
+    
+    # Detailed model listings
+    lines.append("DETAILED MODEL LICENSE INFO URLS:\n")
+    lines.append("=" * 80 + "\n\n")
+    
+    # Sort models by license info URL category then model name
+    def get_sort_key(model):
+        url = model.get('license_info_url', 'Unknown')
+        if 'LICENSE' in url:
+            priority = 1
+        elif 'README.md' in url:
+            priority = 2
+        elif url != 'Unknown' and url.startswith('https://huggingface.co/'):
+            priority = 3
+        else:
+            priority = 4
+        return (priority, model.get('name', ''))
+    
+    sorted_models = sorted(processed_models, key=get_sort_key)
+    
+    for i, model in enumerate(sorted_models, 1):
+        lines.append(f"MODEL {i}: {model.get('canonical_slug', 'Unknown')}\n")
+        lines.append("-" * 50 + "\n")
+        
+        # Key fields
+        lines.append(f"  ID              : {model.get('id', 'Unknown')}\n")
+        lines.append(f"  Canonical Slug  : {model.get('canonical_slug', 'Unknown')}\n")
+        lines.append(f"  HuggingFace ID  : {model.get('hugging_face_id', 'Unknown')}\n")
+        lines.append(f"  License Info URL: {model.get('license_info_url', 'Unknown')}\n")
+        
+        # Add separator between models
+        if i < len(sorted_models):
+            lines.append("\n" + "=" * 80 + "\n\n")
+        else:
+            lines.append("\n")
+
     try:
         with open(report_file, 'w', encoding='utf-8') as f:
-            # Header
-            f.write("=" * 80 + "\n")
-            f.write("OTHER LICENSE INFO URLS REPORT\n")
-            f.write(f"Generated: {get_ist_timestamp()}\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Summary
-            f.write(f"SUMMARY:\n")
-            f.write(f"  Total models : {len(processed_models)}\n")
-            f.write(f"  Input        : B-filtered-models.json\n")
-            f.write(f"  Processor    : E_fetch_other_license_info_urls_from_hf.py\n")
-            f.write(f"  Output       : E-other-license-info-urls-from-hf.json\n\n")
-            
-            # URL Status Statistics
-            url_stats = {}
-            for model in processed_models:
-                url = model.get('license_info_url', 'Unknown')
-                if url.startswith('https://huggingface.co/') and '/blob/main/LICENSE' in url:
-                    category = 'LICENSE file'
-                elif url.startswith('https://huggingface.co/') and '/blob/main/README.md' in url:
-                    category = 'README.md file'
-                elif url.startswith('https://huggingface.co/') and url.count('/') == 3:
-                    category = 'Base repository'
-                elif url == 'Unknown':
-                    category = 'Unknown/Inaccessible'
-                else:
-                    category = 'Other'
-                
-                url_stats[category] = url_stats.get(category, 0) + 1
-            
-            f.write(f"LICENSE INFO URL BREAKDOWN:\n")
-            # Sort by count descending, then by category name
-            sorted_categories = sorted(url_stats.items(), key=lambda x: (-x[1], x[0]))
-            for category, count in sorted_categories:
-                f.write(f"  {count:2d} models: {category}\n")
-            f.write(f"\nTotal categories: {len(url_stats)}\n\n")
-            
-            # Detailed model listings
-            f.write("DETAILED MODEL LICENSE INFO URLS:\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # Sort models by license info URL category then model name
-            def get_sort_key(model):
-                url = model.get('license_info_url', 'Unknown')
-                if 'LICENSE' in url:
-                    priority = 1
-                elif 'README.md' in url:
-                    priority = 2
-                elif url != 'Unknown' and url.startswith('https://huggingface.co/'):
-                    priority = 3
-                else:
-                    priority = 4
-                return (priority, model.get('name', ''))
-            
-            sorted_models = sorted(processed_models, key=get_sort_key)
-            
-            for i, model in enumerate(sorted_models, 1):
-                f.write(f"MODEL {i}: {model.get('canonical_slug', 'Unknown')}\n")
-                f.write("-" * 50 + "\n")
-                
-                # Key fields
-                f.write(f"  ID              : {model.get('id', 'Unknown')}\n")
-                f.write(f"  Canonical Slug  : {model.get('canonical_slug', 'Unknown')}\n")
-                f.write(f"  HuggingFace ID  : {model.get('hugging_face_id', 'Unknown')}\n")
-                f.write(f"  License Info URL: {model.get('license_info_url', 'Unknown')}\n")
-                
-                # Add separator between models
-                if i < len(sorted_models):
-                    f.write("\n" + "=" * 80 + "\n\n")
-                else:
-                    f.write("\n")
-        
+            f.write(''.join(lines))
+
         print(f"✓ License info report saved to: {report_file}")
         return report_file
         
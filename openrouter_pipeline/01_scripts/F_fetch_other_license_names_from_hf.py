@@ -11,7 +11,9 @@ import os
 import time
 import re
 import requests
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 from pathlib import Path
 
@@ -38,7 +40,79 @@ except ImportError:
     print("⚠️ python-dotenv not available, using system environment variables")
 
 # Import output utilities
-import sys; import os; sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils")); from output_utils import get_output_file_path, get_input_file_path, ensure_output_dir_exists, get_ist_timestamp
+import sys; import os; sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils")); from output_utils import get_output_file_path, get_input_file_path, ensure_output_dir_exists, get_ist_timestamp, read_json_file, write_json_file
+from http_utils import RateLimiter, get_retry_after, create_http_session
+
+# Persistent hf_id -> extracted license cache, reused across runs while fresh.
+# Kept outside 02_outputs, which stage A clears at the start of every run.
+LICENSE_CACHE_FILE = Path(__file__).parent.parent / "05_cache" / "F-license-cache.json"
+LICENSE_CACHE_TTL = timedelta(days=7)
+
+# Results that describe a failed lookup rather than a license; never cached
+FAILED_LICENSE_PREFIXES = ('HTTP ', 'Error:', 'Parse Error:')
+# Placeholder names left when the real license could not be resolved (compared lowercased); never cached
+UNRESOLVED_LICENSE_NAMES = ('unknown', 'other')
+
+# Providers with dedicated license handlers (scripts C and D)
+SKIP_PROVIDER_PREFIXES = ('google:', 'meta:')
+
+# License patterns in priority order, compiled once; the first pattern that matches wins.
+# The anchors are ASCII, so they match the raw page bytes without decoding the page.
+LICENSE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    rb'<span class="-mr-1 text-gray-400">License:</span>\s*<span>([^<]+)</span>',  # HF license structure
+    rb'<span[^>]*>License:</span>[^<]*<span[^>]*>([^<]+)</span>',  # General license span structure
+    rb'"license"\s*:\s*"([^"]+)"',  # JSON license field
+    rb'<dt[^>]*>License</dt>\s*<dd[^>]*>([^<]+)</dd>',  # Definition list structure
+    rb'License:\s*([A-Za-z0-9\-\.\s]+)',  # Plain text license
+)]
+
+# Pages are streamed and scanned as they arrive, up to a safety cap
+LICENSE_PAGE_CHUNK_SIZE = 16384
+LICENSE_PAGE_MAX_BYTES = 1024 * 1024
+LICENSE_MATCH_OVERLAP = 1024  # Re-scan this much of the previous bytes so matches can span chunks
+
+# Concurrent fetching, capped to a polite request rate across all threads
+MAX_FETCH_WORKERS = 8
+HF_REQUESTS_PER_SECOND = 5
+
+# Transient gateway errors, retried by extract_license_from_url through the shared rate limiter
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+HF_RATE_LIMITER = RateLimiter(HF_REQUESTS_PER_SECOND, HF_REQUESTS_PER_SECOND)
+
+# Shared by all fetch threads so TCP/TLS connections are reused
+HTTP_SESSION = create_http_session(pool_connections=16)
+
+# Shared Hub API client for repo_info lookups
+HF_API = HfApi(token=os.getenv('HUGGINGFACE_API_KEY'))
+
+
+def find_license_in_response(response: requests.Response) -> str:
+    """
+    Scan a streamed page for a license, stopping as soon as the HF license span is found
+
+    The HF license span is the highest priority pattern, so a hit ends the download
+    early. Otherwise the remaining patterns run in priority order over the page.
+    """
+    primary_pattern = LICENSE_PATTERNS[0]
+    content = b''
+
+    for chunk in response.iter_content(chunk_size=LICENSE_PAGE_CHUNK_SIZE):
+        search_from = max(0, len(content) - LICENSE_MATCH_OVERLAP)
+        content += chunk
+        match = primary_pattern.search(content, search_from)
+        if match:
+            # Return license exactly as found on the page
+            return match.group(1).decode('utf-8', 'replace').strip()
+        if len(content) >= LICENSE_PAGE_MAX_BYTES:
+            break
+
+    for pattern in LICENSE_PATTERNS[1:]:
+        match = pattern.search(content)
+        if match:
+            return match.group(1).decode('utf-8', 'replace').strip()
+
+    return "Unknown"
 
 
 def extract_license_from_url(url: str, source_label: str = "URL", max_retries: int = 3) -> str:
@@ -48,45 +122,29 @@ def extract_license_from_url(url: str, source_label: str = "URL", max_retries: i
 
     for attempt in range(max_retries):
         try:
-            # Add headers to mimic browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-
-            response = requests.get(url, headers=headers, timeout=15)
-
-            # Handle rate limiting with exponential backoff
-            if response.status_code == 429:
-                if attempt < max_retries - 1:
-                    wait_time = (2 ** attempt) * 5  # 5, 10, 20 seconds
-                    print(f"    Rate limited for {source_label}, waiting {wait_time}s (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    return f"HTTP 429 (Rate Limited after {max_retries} attempts)"
-
-            if response.status_code != 200:
-                return f"HTTP {response.status_code}"
-
-            content = response.text
+            HF_RATE_LIMITER.acquire()
+            with HTTP_SESSION.get(url, timeout=15, stream=True) as response:
+                # Handle rate limiting: honor Retry-After, else back off exponentially
+                if response.status_code == 429:
+                    if attempt < max_retries - 1:
+                        wait_time = get_retry_after(response, (2 ** attempt) * 5)  # default 5, 10, 20 seconds
+                        print(f"    Rate limited for {source_label}, waiting {wait_time}s (attempt {attempt + 1}/{max_retries})")
+                        # Pause the shared limiter so other threads back off too; acquire() waits it out
+                        HF_RATE_LIMITER.pause(wait_time)
+                        continue
+                    else:
+                        return f"HTTP 429 (Rate Limited after {max_retries} attempts)"
 
-            # Look for license information in the specific HuggingFace HTML structure
-            patterns = [
-                r'<span class="-mr-1 text-gray-400">License:</span>\s*<span>([^<]+)</span>',  # HF license structure
-                r'<span[^>]*>License:</span>[^<]*<span[^>]*>([^<]+)</span>',  # General license span structure
-                r'"license"\s*:\s*"([^"]+)"',  # JSON license field
-                r'<dt[^>]*>License</dt>\s*<dd[^>]*>([^<]+)</dd>',  # Definition list structure
-                r'License:\s*([A-Za-z0-9\-\.\s]+)',  # Plain text license
-            ]
+                if response.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries - 1:
+                    print(f"    HTTP {response.status_code} for {source_label}, retrying in 3s (attempt {attempt + 1}/{max_retries})")
+                    time.sleep(3)
+                    continue
 
-            for pattern in patterns:
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    license_name = match.group(1).strip()
-                    # Return license exactly as found on the page
-                    return license_name
+                if response.status_code != 200:
+                    return f"HTTP {response.status_code}"
 
-            return "Unknown"
+                # Look for license information in the specific HuggingFace HTML structure
+                return find_license_in_response(response)
 
         except requests.RequestException as e:
             if attempt < max_retries - 1:
@@ -109,20 +167,43 @@ def extract_license_from_hf_page(hf_id: str, max_retries: int = 3) -> str:
     return extract_license_from_url(url, f"base repo page ({hf_id})", max_retries)
 
 
+def fetch_repo_info(hf_id: str, max_retries: int = 3):
+    """Fetch Hub repo info through the shared rate limiter, backing off on HTTP 429"""
+    for attempt in range(max_retries):
+        HF_RATE_LIMITER.acquire()
+        try:
+            return HF_API.repo_info(hf_id)
+        except Exception as e:
+            # Hub HTTP errors carry the response; anything other than a retryable 429 is the caller's
+            response = getattr(e, 'response', None)
+            if getattr(response, 'status_code', None) != 429 or attempt == max_retries - 1:
+                raise
+            wait_time = get_retry_after(response, (2 ** attempt) * 5)  # default 5, 10 seconds
+            print(f"    Rate limited for repo info ({hf_id}), waiting {wait_time}s (attempt {attempt + 1}/{max_retries})")
+            # Pause the shared limiter so other threads back off too; acquire() waits it out
+            HF_RATE_LIMITER.pause(wait_time)
+
+
 def extract_license_from_hf_api(hf_id: str, license_info_url: str = None) -> str:
-    """Extract license from HuggingFace using official Hub API, with web scraping fallback for 'other' licenses"""
+    """Extract license from HuggingFace using official Hub API, with web scraping fallback for 'other' licenses without a card license_name"""
     if not hf_id:
         return "Unknown"
 
     try:
-        api = HfApi(token=os.getenv('HUGGINGFACE_API_KEY'))
-        repo_info = api.repo_info(hf_id)
+        repo_info = fetch_repo_info(hf_id)
 
         if repo_info.cardData:
             license_value = repo_info.cardData.license or 'Unknown'
 
-            # If license is 'other', use web scraping to get the actual license name
+            # If license is 'other', resolve the actual license name
             if license_value.lower() == 'other':
+                # Custom licenses are usually named in the card's license_name field, which is
+                # what the repo page displays; it arrives with repo_info, so no scraping is needed
+                license_name = repo_info.cardData.get('license_name')
+                if isinstance(license_name, str) and license_name.strip():
+                    print(f"  License is 'other', using card license_name for {hf_id}: {license_name.strip()}")
+                    return license_name.strip()
+
                 print(f"  License is 'other', attempting web scraping for {hf_id}")
 
                 # Try license file URL first (from script E's output)
@@ -147,15 +228,44 @@ def extract_license_from_hf_api(hf_id: str, license_info_url: str = None) -> str
         return 'Unknown'
 
 
+def is_cacheable_license(license_name: str) -> bool:
+    """Check if an extracted license is a real result worth caching across runs"""
+    return (license_name.lower() not in UNRESOLVED_LICENSE_NAMES
+            and not license_name.startswith(FAILED_LICENSE_PREFIXES))
+
+
+def load_license_cache(cache_file: Path) -> Dict[str, Dict[str, str]]:
+    """Load cached hf_id -> {license, cached_at} entries, dropping expired ones"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return {}
+
+    cutoff = datetime.now(timezone.utc) - LICENSE_CACHE_TTL
+    fresh_cache = {}
+    for hf_id, entry in cache.items():
+        try:
+            if datetime.fromisoformat(entry['cached_at']) >= cutoff:
+                fresh_cache[hf_id] = entry
+        except (KeyError, TypeError, ValueError):
+            continue
+    return fresh_cache
+
+
+def save_license_cache(cache: Dict[str, Dict[str, str]], cache_file: Path) -> None:
+    """Write the hf_id -> license cache back to disk"""
+    try:
+        cache_file.parent.mkdir(exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"⚠️ Failed to write license cache {cache_file}: {str(e)}")
+
+
 def should_skip_model(name: str) -> bool:
     """Check if model should be skipped (Google, Meta)"""
-    name_lower = name.lower()
-    skip_providers = ['google:', 'meta:']
-    
-    for provider in skip_providers:
-        if name_lower.startswith(provider):
-            return True
-    return False
+    return name.lower().startswith(SKIP_PROVIDER_PREFIXES)
 
 
 def main():
@@ -167,8 +277,7 @@ def main():
     print("Loading stage-E license info data...")
     
     # Load the JSON data
-    with open(get_input_file_path('E-other-license-info-urls-from-hf.json'), 'r') as f:
-        data = json.load(f)
+    data = read_json_file(get_input_file_path('E-other-license-info-urls-from-hf.json'))
 
     # Handle both old format (list) and new format (dict with metadata)
     if isinstance(data, list):
@@ -203,28 +312,45 @@ def main():
     print(f"Found {len(target_models)} models to process (excluding Google/Meta)")
     print(f"Found {len(hf_id_to_license_url)} license file URLs from script E")
 
-    # Extract licenses
-    results = []
+    # Load licenses extracted by earlier runs
+    license_cache = load_license_cache(LICENSE_CACHE_FILE)
+    print(f"Loaded {len(license_cache)} cached licenses from: {LICENSE_CACHE_FILE}")
+
+    # Resolve each distinct hf_id once; results from this run include failed lookups
+    hf_ids = list(dict.fromkeys(model['hugging_face_id'] for model in target_models))
+    licenses_by_hf_id = {hf_id: license_cache[hf_id]['license'] for hf_id in hf_ids if hf_id in license_cache}
+    pending_hf_ids = [hf_id for hf_id in hf_ids if hf_id not in licenses_by_hf_id]
 
-    for i, model in enumerate(target_models, 1):
-        print(f"Processing {i}/{len(target_models)}: {model['name'][:60]}...")
+    print(f"Fetching {len(pending_hf_ids)} licenses from HuggingFace ({len(licenses_by_hf_id)} cached)")
 
-        # Get license_info_url from mapping if available
-        hf_id = model['hugging_face_id']
-        license_info_url = hf_id_to_license_url.get(hf_id)
+    # Fetch uncached licenses concurrently; HF_RATE_LIMITER keeps the request rate polite
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        fetched_licenses = executor.map(extract_license_from_hf_api, pending_hf_ids,
+                                        [hf_id_to_license_url.get(hf_id) for hf_id in pending_hf_ids])
 
-        license_info = extract_license_from_hf_api(hf_id, license_info_url)
+        for i, (hf_id, license_info) in enumerate(zip(pending_hf_ids, fetched_licenses), 1):
+            print(f"Processed {i}/{len(pending_hf_ids)}: {hf_id} -> {license_info}")
+            licenses_by_hf_id[hf_id] = license_info
 
+            if is_cacheable_license(license_info):
+                license_cache[hf_id] = {
+                    'license': license_info,
+                    'cached_at': datetime.now(timezone.utc).isoformat()
+                }
+
+    # Extract licenses
+    results = []
+
+    for model in target_models:
         results.append({
             'id': model['id'],
             'canonical_slug': model['canonical_slug'],     # Primary identifier
             'name': model['name'],
             'hugging_face_id': model['hugging_face_id'],
-            'extracted_license': license_info
+            'extracted_license': licenses_by_hf_id[model['hugging_face_id']]
         })
 
-        # Small delay to be respectful to the API
-        time.sleep(0.1)  # 100ms delay between API calls
+    save_license_cache(license_cache, LICENSE_CACHE_FILE)
     
     # Write results to JSON file
     json_output_file = get_output_file_path('F-other-license-names-from-hf.json')
@@ -239,53 +365,53 @@ def main():
         "models": results
     }
 
-    with open(json_output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    write_json_file(output_data, json_output_file)
     
     # Write human-readable report
     report_output_file = get_output_file_path('F-other-license-names-from-hf-report.txt')
     
-    with open(report_output_file, 'w') as f:
-        # Header
-        f.write("=" * 80 + "\n")
-        f.write("OTHER MODEL LICENSE NAME EXTRACTIONS REPORT\n")
-        f.write(f"Generated: {get_ist_timestamp()}\n")
-        f.write("=" * 80 + "\n\n")
-        
-        # Summary
-        f.write(f"SUMMARY:\n")
-        f.write(f"  Total models : {len(results)}\n")
-        f.write(f"  Input        : E-other-license-info-urls-from-hf.json\n")
-        f.write(f"  Processor    : F_fetch_other_license_names_from_hf.py\n")
-        f.write(f"  Output       : F-other-license-names-from-hf.json\n\n")
-        
-        # License distribution
-        license_counts = {}
-        for model in results:
-            license = model['extracted_license']
-            license_counts[license] = license_counts.get(license, 0) + 1
-        
-        f.write("LICENSE DISTRIBUTION:\n")
-        for license, count in sorted(license_counts.items()):
-            f.write(f"  {license}: {count}\n")
-        f.write(f"\nTotal license types: {len(license_counts)}\n\n")
-        
-        # Detailed results
-        f.write("DETAILED MODEL EXTRACTION RESULTS:\n")
-        f.write("=" * 80 + "\n\n")
+    lines = []
+    
+    # Header
+    lines.append("=" * 80 + "\n")
+    lines.append("OTHER MODEL LICENSE NAME EXTRACTIONS REPORT\n")
+    lines.append(f"Generated: {get_ist_timestamp()}\n")
+    lines.append("=" * 80 + "\n\n")
+    
+    # Summary
+    lines.append(f"SUMMARY:\n")
+    lines.append(f"  Total models : {len(results)}\n")
+    lines.append(f"  Input        : E-other-license-info-urls-from-hf.json\n")
+    lines.append(f"  Processor    : F_fetch_other_license_names_from_hf.py\n")
+    lines.append(f"  Output       : F-other-license-names-from-hf.json\n\n")
+    
+    # License distribution
+    license_counts = Counter(model['extracted_license'] for model in results)
+    
+    lines.append("LICENSE DISTRIBUTION:\n")
+    for license, count in sorted(license_counts.items()):
+        lines.append(f"  {license}: {count}\n")
+    lines.append(f"\nTotal license types: {len(license_counts)}\n\n")
+    
+    # Detailed results
+    lines.append("DETAILED MODEL EXTRACTION RESULTS:\n")
+    lines.append("=" * 80 + "\n\n")
+    
+    for i, model in enumerate(results, 1):
+        lines.append(f"MODEL {i}: {model.get('canonical_slug', 'Unknown')}\n")
+        lines.append("-" * 50 + "\n")
+        lines.append(f"  ID               : {model.get('id', 'Unknown')}\n")
+        lines.append(f"  Canonical Slug   : {model.get('canonical_slug', 'Unknown')}\n")
+        lines.append(f"  HuggingFace ID   : {model.get('hugging_face_id', 'Unknown')}\n")
+        lines.append(f"  Extracted License: {model.get('extracted_license', 'Unknown')}\n")
         
-        for i, model in enumerate(results, 1):
-            f.write(f"MODEL {i}: {model.get('canonical_slug', 'Unknown')}\n")
-            f.write("-" * 50 + "\n")
-            f.write(f"  ID               : {model.get('id', 'Unknown')}\n")
-            f.write(f"  Canonical Slug   : {model.get('canonical_slug', 'Unknown')}\n")
-            f.write(f"  HuggingFace ID   : {model.get('hugging_face_id', 'Unknown')}\n")
-            f.write(f"  Extracted License: {model.get('extracted_license', 'Unknown')}\n")
-            
-            if i < len(results):
-                f.write("\n" + "=" * 80 + "\n\n")
-            else:
-                f.write("\n")
+        if i < len(results):
+            lines.append("\n" + "=" * 80 + "\n\n")
+        else:
+            lines.append("\n")
+
+    with open(report_output_file, 'w', encoding='utf-8') as f:
+        f.write(''.join(lines))
     
     print(f"JSON results written to: {json_output_file}")
     print(f"Report written to: {report_output_file}")
@@ -273,15 +273,13 @@ def save_database_csv(database_records: List[Dict[str, Any]], db_schema: Dict[st
         schema_fields = db_schema.get('schema_fields', [])
         
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=schema_fields)
-            writer.writeheader()
-            
-            for record in database_records:
-                # Ensure all schema fields are present in the correct order
-                ordered_record = {}
-                for field in schema_fields:
-                    ordered_record[field] = record.get(field, '')
-                writer.writerow(ordered_record)
+            writer = csv.writer(f)
+            writer.writerow(schema_fields)
+            # Project each record to a tuple in schema field order
+            writer.writerows(
+                tuple(record.get(field, '') for field in schema_fields)
+                for record in database_records
+            )
         
         print(f"✓ Saved database CSV to: {output_file}")
         return output_file
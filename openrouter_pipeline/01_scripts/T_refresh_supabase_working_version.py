@@ -5,16 +5,20 @@ Supabase OpenRouter Data Refresh Script - PostgreSQL Version
 ====================================
 
 This script refreshes OpenRouter data in Supabase by:
-1. Deleting existing OpenRouter records from working_version_v3 table
-2. Loading finalized data from R-finalized-db-data.json
-3. Inserting fresh OpenRouter data into Supabase
+1. Loading finalized data from R-finalized-db-data.json
+2. Upserting fresh OpenRouter data into the working_version table
+3. Deleting OpenRouter records that are no longer in the finalized data
 
 Features:
 - Direct PostgreSQL connection with pipeline_writer role
 - Comprehensive error handling and logging
 - Data validation and safety checks
-- Bulk insert with transactions
-- Rollback capability with backup
+- Upsert, stale-record sweep and verification committed as a single transaction
+- Skips database writes when both the data and the table's OpenRouter rows match the last
+  successful refresh (05_cache/T-last-refresh-hash.txt)
+- No delete-then-insert window: rows are updated in place by
+  (inference_provider, human_readable_name), see 00_docs/add_working_version_provider_name_key.sql
+  (falls back to delete+insert in the same transaction while that index is missing)
 
 Author: AI Models Discovery Pipeline
 Version: 2.0 (PostgreSQL + RLS)
@@ -24,9 +28,10 @@ Last Updated: 2025-10-02
 import os
 import sys
 import json
+import time
+import hashlib
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 # Third-party imports
@@ -37,15 +42,24 @@ except ImportError:
     print("Error: psycopg2 package not found. Install with: pip install psycopg2-binary")
     sys.exit(1)
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
 # Import database utilities
 sys.path.append(str(Path(__file__).parent.parent.parent))
 try:
     from db_utils import (
         get_pipeline_db_connection,
         get_record_count,
-        backup_records,
+        get_records_fingerprint,
+        index_exists,
         delete_records,
-        insert_records_batch
+        insert_records_batch,
+        upsert_records_batch,
+        delete_stale_records
     )
 except ImportError as e:
     print(f"Error: Required utilities not found in project root: {e}")
@@ -53,33 +67,41 @@ except ImportError as e:
 
 # Import output utilities
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils"))
-from output_utils import get_output_file_path, get_input_file_path, get_ist_timestamp
+from output_utils import get_output_file_path, get_input_file_path, get_ist_timestamp, read_json_file, seek_json_models_prefix
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    env_paths = [
-        Path(__file__).parent.parent.parent / ".env.local",
-        Path("/home/vn6295337/.env"),
-        Path(__file__).parent.parent / ".env",
-        Path(__file__).parent / ".env"
-    ]
-    for env_path in env_paths:
-        if env_path.exists():
-            load_dotenv(env_path)
-            print(f"✅ Loaded environment variables from {env_path}")
-            break
-except ImportError:
-    print("⚠️ python-dotenv not installed")
+# Load environment variables (skipped when the database URL is already set, e.g. in CI)
+if not os.getenv("PIPELINE_SUPABASE_URL"):
+    try:
+        from dotenv import load_dotenv
+        env_paths = [
+            Path(__file__).parent.parent.parent / ".env.local",
+            Path("/home/vn6295337/.env"),
+            Path(__file__).parent.parent / ".env",
+            Path(__file__).parent / ".env"
+        ]
+        for env_path in env_paths:
+            if env_path.exists():
+                load_dotenv(env_path)
+                print(f"✅ Loaded environment variables from {env_path}")
+                break
+    except ImportError:
+        print("⚠️ python-dotenv not installed")
 
 # Configuration
 SCRIPT_DIR = Path(__file__).parent
 JSON_FILE = SCRIPT_DIR / get_input_file_path("R_filtered_db_data.json")
 LOG_FILE = SCRIPT_DIR / get_output_file_path("T-supabase-refresh-report.txt")
+REFRESH_HASH_FILE = SCRIPT_DIR.parent / "05_cache" / "T-last-refresh-hash.txt"
 
 # Database configuration
 TABLE_NAME = "working_version"
 INFERENCE_PROVIDER = "OpenRouter"
+UPSERT_KEY_COLUMNS = ['inference_provider', 'human_readable_name']
+UPSERT_INDEX_NAME = "idx_working_version_openrouter_name"  # Partial unique index on OpenRouter rows
+UPSERT_CONFLICT_WHERE = f"inference_provider = '{INFERENCE_PROVIDER}'"
+UPSERT_PAGE_SIZE = int(os.getenv("REFRESH_PAGE_SIZE", "1000"))  # Rows per multi-row INSERT statement
+AUTO_MANAGED_FIELDS = frozenset({'id', 'created_at', 'updated_at'})
+NULLABLE_FIELDS = frozenset({'license_info_text', 'license_info_url'})
 
 # Setup logging
 def setup_logging():
@@ -111,23 +133,52 @@ def load_finalized_json() -> Optional[List[Dict[str, Any]]]:
         return None
 
     try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        if IJSON_AVAILABLE:
+            # Stream models and keep only OpenRouter ones, without materializing the whole file
+            with open(JSON_FILE, 'rb') as file:
+                # Handle both formats
+                prefix = seek_json_models_prefix(file)
+
+                total_models = 0
+                valid_models = []
+                for model in ijson.items(file, prefix, use_float=True):
+                    total_models += 1
+                    # Validate OpenRouter provider
+                    if model.get('inference_provider') == INFERENCE_PROVIDER:
+                        valid_models.append(model)
+        else:
+            data = read_json_file(JSON_FILE)
 
-        # Handle both formats
-        models = data if isinstance(data, list) else data.get('models', [])
+            # Handle both formats
+            models = data if isinstance(data, list) else data.get('models', [])
+            total_models = len(models)
 
-        if not models:
+            # Validate OpenRouter provider
+            valid_models = [m for m in models if m.get('inference_provider') == INFERENCE_PROVIDER]
+
+        if not total_models:
             logger.error(f"❌ No models found in JSON")
             return None
 
-        # Validate OpenRouter provider
-        valid_models = [m for m in models if m.get('inference_provider') == INFERENCE_PROVIDER]
-
         if not valid_models:
             logger.error(f"❌ No valid OpenRouter models found in JSON")
             return None
 
+        # Skip models without a name: they can never match an existing row or the stale-record sweep
+        named_models = [model for model in valid_models if model.get('human_readable_name')]
+        if len(named_models) < len(valid_models):
+            logger.warning(f"⚠️ Skipped {len(valid_models) - len(named_models)} OpenRouter models without a human_readable_name")
+            valid_models = named_models
+            if not valid_models:
+                logger.error(f"❌ No named OpenRouter models found in JSON")
+                return None
+
+        # Collapse duplicate names (last one wins) so the upsert never hits the same key twice
+        unique_models = {model.get('human_readable_name'): model for model in valid_models}
+        if len(unique_models) < len(valid_models):
+            logger.warning(f"⚠️ Collapsed {len(valid_models) - len(unique_models)} duplicate OpenRouter models by human_readable_name")
+            valid_models = list(unique_models.values())
+
         logger.info(f"✅ Loaded {len(valid_models)} valid OpenRouter models from JSON")
         return valid_models
 
@@ -137,51 +188,119 @@ def load_finalized_json() -> Optional[List[Dict[str, Any]]]:
 
 
 def prepare_data_for_insert(models: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Prepare JSON data for database insertion."""
+    """Prepare JSON data for database insertion. Cleans the model dicts in place and returns them."""
     logger.info("🧹 Preparing data for database insertion...")
 
-    prepared_models = []
-    auto_managed_fields = ['id', 'created_at', 'updated_at']
-
     for model in models:
         # Remove auto-managed fields
-        clean_model = {k: v for k, v in model.items() if k not in auto_managed_fields}
+        for field in AUTO_MANAGED_FIELDS:
+            model.pop(field, None)
 
         # Convert empty strings to None for nullable fields
-        nullable_fields = ['license_info_text', 'license_info_url']
-        for field in nullable_fields:
-            if field in clean_model and clean_model[field] is not None and not str(clean_model[field]).strip():
-                clean_model[field] = None
+        for field in NULLABLE_FIELDS:
+            value = model.get(field)
+            if isinstance(value, str) and (not value or value.isspace()):
+                model[field] = None
 
-        prepared_models.append(clean_model)
+    logger.info(f"✅ Prepared {len(models)} models for insertion")
+    return models
 
-    logger.info(f"✅ Prepared {len(prepared_models)} models for insertion")
-    return prepared_models
 
+def compute_refresh_hash(models: List[Dict[str, Any]]) -> str:
+    """Content hash of the prepared models, independent of key order."""
+    payload = json.dumps(models, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
 
-def restore_backup_data(conn, backup_data: List[Dict[str, Any]]) -> bool:
-    """Restore backed up records (rollback operation)."""
-    logger.info(f"🔄 Rolling back: Restoring {len(backup_data)} OpenRouter records...")
 
-    if not backup_data:
-        logger.info("✅ No data to restore")
-        return True
+def load_last_refresh_state() -> Tuple[Optional[str], Optional[str]]:
+    """Data hash and table fingerprint recorded by the last committed refresh, if any."""
+    try:
+        lines = REFRESH_HASH_FILE.read_text(encoding='utf-8').split()
+    except OSError:
+        return None, None
+    if len(lines) != 2:
+        return None, None
+    return lines[0], lines[1]
 
-    # Remove auto-managed fields
-    auto_managed_fields = ['id', 'created_at', 'updated_at']
-    clean_backup = [{k: v for k, v in record.items() if k not in auto_managed_fields}
-                    for record in backup_data]
 
-    logger.info(f"   Prepared {len(clean_backup)} records for restoration")
+def save_refresh_state(refresh_hash: str, fingerprint: str) -> None:
+    """Record the data hash and resulting table fingerprint of a committed refresh (best-effort)."""
+    try:
+        REFRESH_HASH_FILE.parent.mkdir(exist_ok=True)
+        REFRESH_HASH_FILE.write_text(f"{refresh_hash}\n{fingerprint}\n", encoding='utf-8')
+    except OSError as e:
+        logger.warning(f"⚠️ Could not save refresh hash: {str(e)}")
+
+
+def write_working_version(conn, prepared_models: List[Dict[str, Any]], initial_count: int,
+                          refresh_hash: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Write the models into working_version and commit, then record the refresh state.
+
+    Returns (write mode, deleted count, final count), or None if nothing was applied.
+    """
+    # Upsert needs the unique key from 00_docs/add_working_version_provider_name_key.sql
+    use_upsert = index_exists(conn, TABLE_NAME, UPSERT_INDEX_NAME)
+    write_mode = 'upsert' if use_upsert else 'delete+insert'
+    if not use_upsert:
+        logger.warning(f"⚠️ Unique index {UPSERT_INDEX_NAME} not found - falling back to {write_mode}")
+
+    # Step 5: Write new data into working_version
+    logger.info(f"📤 Writing {len(prepared_models)} models into {TABLE_NAME}...")
+
+    # Write working_version data (critical operation). The write, stale-record cleanup and
+    # verification share one transaction, so any failure rolls the table back as a whole
+    if use_upsert:
+        if not upsert_records_batch(conn, TABLE_NAME, prepared_models, UPSERT_KEY_COLUMNS,
+                                    batch_size=UPSERT_PAGE_SIZE, commit=False,
+                                    conflict_where=UPSERT_CONFLICT_WHERE):
+            logger.error("❌ REFRESH FAILED: Data upsert failed - no changes were applied")
+            return None
 
-    # Use batch insert
-    if insert_records_batch(conn, TABLE_NAME, clean_backup, batch_size=50):
-        final_count = get_record_count(conn, TABLE_NAME, INFERENCE_PROVIDER)
-        logger.info(f"✅ Rollback successful: {final_count} OpenRouter records restored")
-        return True
+        logger.info(f"✅ Successfully upserted {len(prepared_models)} models")
+
+        # Step 6: Delete OpenRouter records that are no longer in the finalized data
+        logger.info(f"🗑️ Deleting stale OpenRouter records from {TABLE_NAME}...")
+        deleted_count = delete_stale_records(conn, TABLE_NAME, INFERENCE_PROVIDER, 'human_readable_name',
+                                             [model['human_readable_name'] for model in prepared_models],
+                                             commit=False)
+        if deleted_count is None:
+            logger.error("❌ REFRESH FAILED: Could not delete stale records - no changes were applied")
+            return None
+
+        logger.info(f"✅ Successfully deleted {deleted_count} stale OpenRouter records")
     else:
-        logger.error(f"❌ Rollback failed")
-        return False
+        # Step 6 (fallback): Replace all OpenRouter records
+        logger.info(f"🗑️ Deleting existing OpenRouter records from {TABLE_NAME}...")
+        if not delete_records(conn, TABLE_NAME, INFERENCE_PROVIDER, commit=False):
+            logger.error("❌ REFRESH FAILED: Could not delete existing records - no changes were applied")
+            return None
+        deleted_count = initial_count
+
+        if not insert_records_batch(conn, TABLE_NAME, prepared_models, batch_size=UPSERT_PAGE_SIZE, commit=False):
+            logger.error("❌ REFRESH FAILED: Data insert failed - no changes were applied")
+            return None
+
+        logger.info(f"✅ Successfully replaced {deleted_count} records with {len(prepared_models)} models")
+
+    # Step 7: Verify results before committing
+    logger.info(f"🔍 Verifying {write_mode} results...")
+    final_count = get_record_count(conn, TABLE_NAME, INFERENCE_PROVIDER)
+    if final_count != len(prepared_models):
+        conn.rollback()
+        logger.error(f"❌ Verification failed: Expected {len(prepared_models)}, found {final_count}")
+        logger.error("❌ REFRESH FAILED: Verification failed - no changes were applied")
+        return None
+
+    conn.commit()
+    logger.info("✅ Refresh committed")
+
+    # Remember the committed data together with the rows it produced
+    fingerprint = get_records_fingerprint(conn, TABLE_NAME, INFERENCE_PROVIDER)
+    if fingerprint:
+        save_refresh_state(refresh_hash, fingerprint)
+
+    return write_mode, deleted_count, final_count
 
 
 def main():
@@ -189,9 +308,8 @@ def main():
     logger.info("=" * 60)
     logger.info("SUPABASE OPENROUTER DATA REFRESH STARTED")
     logger.info("=" * 60)
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     conn = None
-    backup_data = None
 
     try:
         # Step 1: Connect to database
@@ -221,27 +339,23 @@ def main():
             logger.error("❌ REFRESH FAILED: No valid models to insert")
             return False
 
-        # Step 5: Backup existing data
-        logger.info("🛡️ CREATING BACKUP FOR ROLLBACK PROTECTION...")
-        backup_data = backup_records(conn, TABLE_NAME, INFERENCE_PROVIDER)
-        if backup_data is None:
-            logger.error("❌ REFRESH FAILED: Could not backup existing data - ABORTING")
-            return False
-
-        logger.info(f"✅ Backed up {len(backup_data)} existing OpenRouter records")
-
-        # Step 6: Delete existing data
-        logger.info(f"🗑️ Deleting existing OpenRouter records from {TABLE_NAME}...")
-        if not delete_records(conn, TABLE_NAME, INFERENCE_PROVIDER):
-            logger.error("❌ REFRESH FAILED: Could not delete existing data")
-            return False
-
-        logger.info(f"✅ Successfully deleted {initial_count} OpenRouter records")
-
-        # Step 7: Insert new data into working_version AND prepare rate limits in parallel
-        logger.info(f"📤 Inserting {len(prepared_models)} models into {TABLE_NAME}...")
+        # Skip the working_version write when the data matches the last committed refresh and the
+        # table's OpenRouter rows are still exactly what that refresh left behind. Rate limits are
+        # refreshed either way, since their table can change independently of working_version
+        refresh_hash = compute_refresh_hash(prepared_models)
+        last_hash, last_fingerprint = load_last_refresh_state()
+        if (refresh_hash == last_hash
+                and get_records_fingerprint(conn, TABLE_NAME, INFERENCE_PROVIDER) == last_fingerprint):
+            logger.info("✅ Finalized data unchanged since the last successful refresh - skipping working_version writes")
+            write_mode, records_written, deleted_count, final_count = 'skipped (unchanged)', 0, 0, initial_count
+        else:
+            write_result = write_working_version(conn, prepared_models, initial_count, refresh_hash)
+            if write_result is None:
+                return False
+            write_mode, deleted_count, final_count = write_result
+            records_written = len(prepared_models)
 
-        # Prepare rate limit records in parallel
+        # Step 8: Prepare rate limit records
         rate_limit_records = []
         try:
             from rate_limit_parser import parse_rate_limits
@@ -260,17 +374,6 @@ def main():
         except Exception as e:
             logger.warning(f"⚠️ Rate limit parsing failed: {str(e)}")
 
-        # Insert working_version data (critical operation)
-        if not insert_records_batch(conn, TABLE_NAME, prepared_models, batch_size=100):
-            logger.error("❌ REFRESH FAILED: Data insertion failed - INITIATING ROLLBACK")
-            if restore_backup_data(conn, backup_data):
-                logger.info("✅ ROLLBACK SUCCESSFUL: Original data restored")
-            else:
-                logger.error("❌ ROLLBACK FAILED: Manual intervention required!")
-            return False
-
-        logger.info(f"✅ Successfully inserted {len(prepared_models)} models")
-
         # Insert rate limits (best-effort, non-blocking)
         logger.info(f"📊 Attempting to update rate limits table...")
         logger.info(f"📊 Rate limit records prepared: {len(rate_limit_records)}")
@@ -298,34 +401,21 @@ def main():
 
         # Note: Model-AA mappings are refreshed by workflow as a separate step
 
-        # Step 8: Verify results
-        logger.info("🔍 Verifying insertion results...")
-        final_count = get_record_count(conn, TABLE_NAME, INFERENCE_PROVIDER)
-        if final_count != len(prepared_models):
-            logger.error(f"❌ Verification failed: Expected {len(prepared_models)}, found {final_count}")
-            logger.error("❌ REFRESH FAILED: Verification failed - INITIATING ROLLBACK")
-            if restore_backup_data(conn, backup_data):
-                logger.info("✅ ROLLBACK SUCCESSFUL: Original data restored")
-            else:
-                logger.error("❌ ROLLBACK FAILED: Manual intervention required!")
-            return False
-
         # Success
-        end_time = datetime.now()
-        duration = end_time - start_time
+        duration = time.perf_counter() - start_time
 
         logger.info("=" * 60)
         logger.info("🎉 SUPABASE OPENROUTER DATA REFRESH COMPLETED SUCCESSFULLY")
         logger.info("=" * 60)
         logger.info(f"📊 Summary:")
         logger.info(f"   • Initial OpenRouter records: {initial_count}")
-        logger.info(f"   • Records backed up: {len(backup_data)}")
-        logger.info(f"   • Records deleted: {initial_count}")
-        logger.info(f"   • New records inserted: {len(prepared_models)}")
+        logger.info(f"   • Write mode: {write_mode}")
+        logger.info(f"   • Records written: {records_written}")
+        logger.info(f"   • Records deleted: {deleted_count}")
         logger.info(f"   • Final record count: {final_count}")
         logger.info(f"   • Rate limits table: Updated")
         logger.info(f"   • Model-AA mappings: Refreshed for {INFERENCE_PROVIDER}")
-        logger.info(f"   • Processing time: {duration}")
+        logger.info(f"   • Processing time: {duration:.2f}s")
         logger.info(f"   • Report file: {LOG_FILE}")
         logger.info("=" * 60)
 
@@ -333,12 +423,6 @@ def main():
 
     except Exception as e:
         logger.error(f"❌ UNEXPECTED ERROR: {str(e)}")
-        if backup_data and conn:
-            logger.info("🔄 Attempting emergency rollback...")
-            if restore_backup_data(conn, backup_data):
-                logger.info("✅ EMERGENCY ROLLBACK SUCCESSFUL")
-            else:
-                logger.error("❌ EMERGENCY ROLLBACK FAILED")
         return False
 
     finally:
@@ -5,14 +5,14 @@ Production Deployment Script: OpenRouter Data Migration - PostgreSQL Version
 ==============================================
 
 This script deploys OpenRouter data from working_version_v3 to ai_models_main_v3 by:
-1. Backing up existing OpenRouter records from ai_models_main_v3
-2. Deleting existing OpenRouter records from ai_models_main_v3
-3. Copying OpenRouter data from working_version_v3 to ai_models_main_v3
+1. Deleting existing OpenRouter records from ai_models_main_v3
+2. Copying OpenRouter data from working_version_v3 to ai_models_main_v3
+3. Verifying the result before committing
 
 Features:
 - Direct PostgreSQL connection with pipeline_writer role
-- Complete rollback protection with backup/restore
-- Bulk operations with transactions
+- Delete, deploy and verification committed as a single transaction
+- Complete rollback protection: any failure rolls the transaction back
 - Comprehensive error handling and logging
 
 Author: AI Models Discovery Pipeline
@@ -41,7 +41,6 @@ try:
     from db_utils import (
         get_pipeline_db_connection,
         get_record_count,
-        backup_records,
         delete_records,
         insert_records_batch,
         load_staging_data
@@ -54,22 +53,23 @@ except ImportError:
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "04_utils"))
 from output_utils import get_output_file_path, get_ist_timestamp
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    env_paths = [
-        Path(__file__).parent.parent.parent / ".env.local",
-        Path("/home/vn6295337/.env"),
-        Path(__file__).parent.parent / ".env",
-        Path(__file__).parent / ".env"
-    ]
-    for env_path in env_paths:
-        if env_path.exists():
-            load_dotenv(env_path)
-            print(f"✅ Loaded environment variables from {env_path}")
-            break
-except ImportError:
-    print("⚠️ python-dotenv not installed")
+# Load environment variables (skipped when the database URL is already set, e.g. in CI)
+if not os.getenv("PIPELINE_SUPABASE_URL"):
+    try:
+        from dotenv import load_dotenv
+        env_paths = [
+            Path(__file__).parent.parent.parent / ".env.local",
+            Path("/home/vn6295337/.env"),
+            Path(__file__).parent.parent / ".env",
+            Path(__file__).parent / ".env"
+        ]
+        for env_path in env_paths:
+            if env_path.exists():
+                load_dotenv(env_path)
+                print(f"✅ Loaded environment variables from {env_path}")
+                break
+    except ImportError:
+        print("⚠️ python-dotenv not installed")
 
 # Configuration
 LOG_FILE = get_output_file_path("U-deploy-to-ai-models-main-report.txt")
@@ -78,6 +78,9 @@ LOG_FILE = get_output_file_path("U-deploy-to-ai-models-main-report.txt")
 STAGING_TABLE = "working_version"
 PRODUCTION_TABLE = "ai_models_main"
 INFERENCE_PROVIDER = "OpenRouter"
+AUTO_MANAGED_FIELDS = frozenset({'id', 'created_at', 'updated_at'})
+EXCLUDED_FIELDS = frozenset({'provider_slug'})  # Fields that exist in working_version but not in ai_models_main
+NULLABLE_FIELDS = frozenset({'license_info_text', 'license_info_url'})
 
 # Setup logging
 def setup_logging():
@@ -101,52 +104,24 @@ logger = setup_logging()
 
 
 def prepare_data_for_production(staging_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Prepare staging data for production deployment."""
+    """Prepare staging data for production deployment. Cleans the record dicts in place and returns them."""
     logger.info("🧹 Preparing staging data for production deployment...")
 
-    prepared_models = []
-    auto_managed_fields = ['id', 'created_at', 'updated_at']
-    excluded_fields = ['provider_slug']  # Fields that exist in working_version but not in ai_models_main
+    dropped_fields = AUTO_MANAGED_FIELDS | EXCLUDED_FIELDS
 
     for model in staging_data:
         # Remove auto-managed and excluded fields
-        clean_model = {k: v for k, v in model.items() if k not in auto_managed_fields + excluded_fields}
+        for field in dropped_fields:
+            model.pop(field, None)
 
         # Convert empty strings to None for nullable fields
-        nullable_fields = ['license_info_text', 'license_info_url']
-        for field in nullable_fields:
-            if field in clean_model and clean_model[field] is not None and not str(clean_model[field]).strip():
-                clean_model[field] = None
-
-        prepared_models.append(clean_model)
-
-    logger.info(f"✅ Prepared {len(prepared_models)} models for production deployment")
-    return prepared_models
-
-
-def restore_production_backup(conn, backup_data: List[Dict[str, Any]]) -> bool:
-    """Restore backed up records to production (rollback operation)."""
-    logger.info(f"🔄 Rolling back: Restoring {len(backup_data)} OpenRouter records to production...")
-
-    if not backup_data:
-        logger.info("✅ No production data to restore")
-        return True
+        for field in NULLABLE_FIELDS:
+            value = model.get(field)
+            if isinstance(value, str) and (not value or value.isspace()):
+                model[field] = None
 
-    # Remove auto-managed fields
-    auto_managed_fields = ['id', 'created_at', 'updated_at']
-    clean_backup = [{k: v for k, v in record.items() if k not in auto_managed_fields}
-                    for record in backup_data]
-
-    logger.info(f"   Prepared {len(clean_backup)} records for restoration")
-
-    # Use batch insert
-    if insert_records_batch(conn, PRODUCTION_TABLE, clean_backup, batch_size=50):
-        final_count = get_record_count(conn, PRODUCTION_TABLE, INFERENCE_PROVIDER)
-        logger.info(f"✅ Rollback successful: {final_count} OpenRouter records restored to production")
-        return True
-    else:
-        logger.error(f"❌ Rollback failed")
-        return False
+    logger.info(f"✅ Prepared {len(staging_data)} models for production deployment")
+    return staging_data
 
 
 def main():
@@ -156,7 +131,6 @@ def main():
     logger.info("=" * 70)
     start_time = datetime.now()
     conn = None
-    backup_data = None
 
     try:
         # Step 1: Connect to database
@@ -196,49 +170,38 @@ def main():
             logger.error("❌ DEPLOYMENT FAILED: No valid data to deploy")
             return False
 
-        # Step 5: Backup existing production data
-        logger.info("🛡️ CREATING PRODUCTION BACKUP FOR ROLLBACK PROTECTION...")
-        backup_data = backup_records(conn, PRODUCTION_TABLE, INFERENCE_PROVIDER)
-        if backup_data is None:
-            logger.error("❌ DEPLOYMENT FAILED: Could not backup production data - ABORTING")
-            return False
-
-        logger.info(f"✅ Backed up {len(backup_data)} existing OpenRouter records from production")
-
-        # Step 6: Delete existing production data
+        # Steps 5-7 share one transaction: nothing is committed until the deployment is verified,
+        # and any failure rolls production back to its original state
+        # Step 5: Delete existing production data
         logger.info(f"🗑️ Deleting existing OpenRouter records from {PRODUCTION_TABLE}...")
-        if not delete_records(conn, PRODUCTION_TABLE, INFERENCE_PROVIDER):
-            logger.error("❌ DEPLOYMENT FAILED: Could not delete existing production data")
+        if not delete_records(conn, PRODUCTION_TABLE, INFERENCE_PROVIDER, commit=False):
+            logger.error("❌ DEPLOYMENT FAILED: Could not delete existing production data - no changes were applied")
             return False
 
-        logger.info(f"✅ Successfully deleted {production_count} OpenRouter records from production")
+        logger.info(f"✅ Deleted {production_count} OpenRouter records from production (pending commit)")
 
-        # Step 7: Deploy new data
+        # Step 6: Deploy new data
         logger.info(f"🚀 Deploying {len(prepared_data)} models to production ({PRODUCTION_TABLE})...")
-        if not insert_records_batch(conn, PRODUCTION_TABLE, prepared_data, batch_size=100):
-            logger.error("❌ DEPLOYMENT FAILED: Data deployment failed - INITIATING ROLLBACK")
-            if restore_production_backup(conn, backup_data):
-                logger.info("✅ ROLLBACK SUCCESSFUL: Original production data restored")
-            else:
-                logger.error("❌ ROLLBACK FAILED: Manual intervention required!")
+        if not insert_records_batch(conn, PRODUCTION_TABLE, prepared_data, batch_size=100, commit=False):
+            logger.error("❌ DEPLOYMENT FAILED: Data deployment failed - ROLLED BACK, original production data kept")
             return False
 
-        logger.info(f"✅ Successfully deployed {len(prepared_data)} models to production")
+        logger.info(f"✅ Deployed {len(prepared_data)} models to production (pending commit)")
 
-        # Step 8: Verify deployment
+        # Step 7: Verify deployment
         logger.info("🔍 Verifying production deployment results...")
         final_count = get_record_count(conn, PRODUCTION_TABLE, INFERENCE_PROVIDER)
 
         tolerance = max(1, int(len(prepared_data) * 0.05))  # 5% tolerance
-        if abs(final_count - len(prepared_data)) > tolerance:
+        if final_count is None or abs(final_count - len(prepared_data)) > tolerance:
+            conn.rollback()
             logger.error(f"❌ Verification failed: Expected ~{len(prepared_data)}, found {final_count}")
-            logger.error("❌ DEPLOYMENT FAILED: Verification failed - INITIATING ROLLBACK")
-            if restore_production_backup(conn, backup_data):
-                logger.info("✅ ROLLBACK SUCCESSFUL: Original production data restored")
-            else:
-                logger.error("❌ ROLLBACK FAILED: Manual intervention required!")
+            logger.error("❌ DEPLOYMENT FAILED: Verification failed - ROLLED BACK, original production data kept")
             return False
 
+        conn.commit()
+        logger.info("✅ Deployment committed")
+
         # Success
         end_time = datetime.now()
         duration = end_time - start_time
@@ -248,7 +211,6 @@ def main():
         logger.info("=" * 70)
         logger.info(f"📊 Deployment Summary:")
         logger.info(f"   • Staging records processed: {len(staging_data)}")
-        logger.info(f"   • Production records backed up: {len(backup_data)}")
         logger.info(f"   • Production records deleted: {production_count}")
         logger.info(f"   • New records deployed: {len(prepared_data)}")
         logger.info(f"   • Final production count: {final_count}")
@@ -261,12 +223,7 @@ def main():
 
     except Exception as e:
         logger.error(f"❌ UNEXPECTED ERROR: {str(e)}")
-        if backup_data and conn:
-            logger.info("🔄 Attempting emergency rollback...")
-            if restore_production_backup(conn, backup_data):
-                logger.info("✅ EMERGENCY ROLLBACK SUCCESSFUL")
-            else:
-                logger.error("❌ EMERGENCY ROLLBACK FAILED")
+        logger.info("🔄 Uncommitted changes are discarded when the connection closes")
         return False
 
     finally:
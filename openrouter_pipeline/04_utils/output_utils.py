@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 """
 Output Directory Utilities
-Provides centralized path management for pipeline outputs
+Provides centralized path management and JSON file I/O for pipeline outputs
 """
+import codecs
+import json
+import math
 import os
 import shutil
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 def get_output_dir() -> str:
     """
@@ -48,6 +58,99 @@ def get_input_file_path(filename: str) -> str:
     """
     return os.path.join(get_output_dir(), filename)
 
+def read_json_file(file_path) -> Any:
+    """
+    Read and parse a JSON file, using orjson when it is available
+
+    Args:
+        file_path: Path to the JSON file
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def seek_json_models_prefix(json_file) -> str:
+    """
+    Position a binary JSON file for ijson and return the prefix of its models
+
+    Handles both the old format (top-level list of models) and the new format
+    (dict with metadata and a models list). A UTF-8 BOM, which ijson does not
+    accept, is skipped, and any amount of leading whitespace is read past
+    before the first byte decides the format.
+
+    Args:
+        json_file: JSON file opened in binary mode, positioned at its start
+
+    Returns:
+        str: 'item' for a top-level list, otherwise 'models.item'
+    """
+    start = len(codecs.BOM_UTF8) if json_file.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8 else 0
+    json_file.seek(start)
+
+    head = b''
+    while not head:
+        chunk = json_file.read(64)
+        if not chunk:
+            break
+        head = chunk.lstrip()
+    json_file.seek(start)
+
+    return 'item' if head.startswith(b'[') else 'models.item'
+
+def _replace_non_finite_floats(data: Any) -> Any:
+    """
+    Copy data with NaN and +/-Infinity replaced by None, as orjson serializes them
+    """
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _replace_non_finite_floats(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_replace_non_finite_floats(value) for value in data]
+    return data
+
+def write_json_file(data: Any, file_path) -> None:
+    """
+    Write data as 2-space indented JSON, using orjson when it is available
+
+    Both paths write the same JSON:
+    - UTF-8 encoded, with non-ASCII text written as-is rather than \\uXXXX escapes,
+      so readers must open the file with encoding='utf-8' (or use read_json_file)
+    - NaN and +/-Infinity written as null, keeping the output valid JSON
+    - Non-str dict keys (int, float, bool, None) converted to strings
+
+    Args:
+        data: JSON-serializable data
+        file_path: Path to the output file
+
+    Raises:
+        TypeError: If data is not JSON serializable
+    """
+    if ORJSON_AVAILABLE:
+        # orjson.JSONEncodeError subclasses TypeError
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+
+    try:
+        content = json.dumps(data, indent=2, ensure_ascii=False, allow_nan=False)
+    except ValueError:
+        # Raised for NaN/Infinity, which the orjson path writes as null
+        content = json.dumps(_replace_non_finite_floats(data), indent=2, ensure_ascii=False)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
 def ensure_output_dir_exists():
     """
     Ensure the 02_outputs directory exists